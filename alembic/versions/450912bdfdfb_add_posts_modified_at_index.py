@@ -0,0 +1,32 @@
+"""add posts modified_at index
+
+Revision ID: 450912bdfdfb
+Revises: 9f9a179d1868
+Create Date: 2026-10-18 13:26:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '450912bdfdfb'
+down_revision: Union[str, Sequence[str], None] = '9f9a179d1868'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index('ix_posts_modified_at_id', 'posts',
+                        [sa.text('coalesce(updated_at, created_at)'), 'id'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_modified_at_id', table_name='posts', postgresql_concurrently=True)
@@ -0,0 +1,31 @@
+"""add posts created_at id index
+
+Revision ID: 532626ac193a
+Revises: 535198b91216
+Create Date: 2026-10-18 10:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '532626ac193a'
+down_revision: Union[str, Sequence[str], None] = '535198b91216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY evita bloquear escrituras en tablas grandes; requiere estar fuera de la transacción
+    with op.get_context().autocommit_block():
+        op.create_index('ix_posts_created_at_id', 'posts', ['created_at', 'id'], unique=False,
+                        postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_posts_created_at_id', table_name='posts', postgresql_concurrently=True)
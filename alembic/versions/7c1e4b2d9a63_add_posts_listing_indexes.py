@@ -0,0 +1,52 @@
+"""add posts listing indexes
+
+Revision ID: 7c1e4b2d9a63
+Revises: 450912bdfdfb
+Create Date: 2026-10-18 16:42:37.204816
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e4b2d9a63'
+down_revision: Union[str, Sequence[str], None] = '450912bdfdfb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (nombre, columnas, condición del índice parcial)
+INDEXES = [
+    # user_id (+ orden por created_at); también cubre los borrados en cascada de la FK
+    ('ix_posts_user_id_created_at_id', ['user_id', 'created_at DESC', 'id DESC'], None),
+    # Orden por clave sin filtro de publicación (created_at ya tiene ix_posts_created_at_id)
+    ('ix_posts_published_at_id', ['published_at DESC NULLS LAST', 'id DESC'], None),
+    ('ix_posts_views_id', ['views DESC', 'id DESC'], None),
+    ('ix_posts_rating_id', ['rating DESC NULLS LAST', 'id DESC'], None),
+    # Feed de publicados (WHERE published) por cada clave de orden
+    ('ix_posts_published_feed_published_at', ['published_at DESC NULLS LAST', 'id DESC'], 'published'),
+    ('ix_posts_published_feed_created_at', ['created_at DESC', 'id DESC'], 'published'),
+    ('ix_posts_published_feed_views', ['views DESC', 'id DESC'], 'published'),
+    ('ix_posts_published_feed_rating', ['rating DESC NULLS LAST', 'id DESC'], 'published'),
+    # Filtro por rango de event_date
+    ('ix_posts_event_date', ['event_date'], 'event_date IS NOT NULL'),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY no bloquea escrituras en tablas grandes (no puede ir en una transacción)
+    with op.get_context().autocommit_block():
+        for name, columns, where in INDEXES:
+            op.create_index(name, 'posts', [sa.text(column) for column in columns], unique=False,
+                            postgresql_where=sa.text(where) if where else None,
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='posts', postgresql_concurrently=True)
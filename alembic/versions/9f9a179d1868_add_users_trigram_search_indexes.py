@@ -0,0 +1,36 @@
+"""add users trigram search indexes
+
+Revision ID: 9f9a179d1868
+Revises: 532626ac193a
+Create Date: 2026-10-18 11:03:17.582164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f9a179d1868'
+down_revision: Union[str, Sequence[str], None] = '532626ac193a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ('first_name', 'last_name', 'email')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.create_index(f'ix_users_{column}_trgm', 'users', [column], unique=False,
+                            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'},
+                            postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for column in SEARCH_COLUMNS:
+            op.drop_index(f'ix_users_{column}_trgm', table_name='users', postgresql_concurrently=True)
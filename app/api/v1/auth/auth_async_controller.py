@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.auth.auth_service import AsyncAuthService, get_current_principal
+from app.api.v1.auth.auth_schema import PrincipalRs, TokenRs
+from app.core.database import get_async_db
+from app.core.response import ApiStatus, ApiResponse
+
+# Mismos endpoints que auth_controller, ejecutados en el event loop (DB_MODE=async)
+router = APIRouter()
+
+@router.post("/token", response_model=TokenRs,
+             summary="Obtener token de acceso",
+             description="Verifica email (campo username) y contraseña y devuelve un JWT de tipo bearer")
+async def login(form: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+  return await AsyncAuthService(db).login(form.username, form.password)
+
+@router.get("/me", response_model=ApiResponse[PrincipalRs],
+            summary="Usuario autenticado", description="Devuelve el usuario asociado al token enviado")
+async def me(principal: PrincipalRs = Depends(get_current_principal)):
+  return ApiResponse(status=ApiStatus.SUCCESS, message="Usuario autenticado", data=principal)
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.orm import Session
+from app.api.v1.auth.auth_service import AuthService, get_current_principal
+from app.api.v1.auth.auth_schema import PrincipalRs, TokenRs
+from app.core.database import get_db
+from app.core.response import ApiStatus, ApiResponse
+
+router = APIRouter()
+
+@router.post("/token", response_model=TokenRs,
+             summary="Obtener token de acceso",
+             description="Verifica email (campo username) y contraseña y devuelve un JWT de tipo bearer")
+def login(form: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+  return AuthService(db).login(form.username, form.password)
+
+@router.get("/me", response_model=ApiResponse[PrincipalRs],
+            summary="Usuario autenticado", description="Devuelve el usuario asociado al token enviado")
+async def me(principal: PrincipalRs = Depends(get_current_principal)):
+  return ApiResponse(status=ApiStatus.SUCCESS, message="Usuario autenticado", data=principal)
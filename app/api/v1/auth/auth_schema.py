@@ -0,0 +1,15 @@
+from pydantic import BaseModel, ConfigDict, EmailStr
+
+# Respuesta de /auth/token (formato OAuth2: sin el sobre ApiResponse, lo leen los clientes OAuth2)
+class TokenRs(BaseModel):
+  access_token: str
+  token_type: str = "bearer"
+  expires_in: int  # Segundos de validez
+
+# Usuario autenticado (lo que cachea y devuelve la dependencia de autenticación)
+class PrincipalRs(BaseModel):
+  model_config = ConfigDict(from_attributes=True)
+  id: int
+  email: EmailStr
+  role: str
+  is_active: bool
@@ -0,0 +1,80 @@
+from typing import Optional
+from fastapi import Depends
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from app.core import database
+from app.core.config import get_settings
+from app.core.error_type import ForbiddenError, UnauthorizedError
+from app.core.security import create_access_token, principal_cache, verify_access_token
+from app.api.v1.auth.auth_schema import PrincipalRs, TokenRs
+from app.api.v1.user.user_entity import User
+from app.api.v1.user.user_repository import UserRepository, AsyncUserRepository
+from app.api.v1.user.user_service import UserService, AsyncUserService
+
+settings = get_settings()
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+
+def issue_token(user: Optional[User]) -> TokenRs:
+  """Emite el token de un usuario ya verificado y deja su principal en caché"""
+  if not user:
+    raise UnauthorizedError("Email o contraseña incorrectos")
+  if not user.is_active:
+    raise ForbiddenError("Usuario inactivo")
+  principal_cache.set(user.id, PrincipalRs.model_validate(user))
+  access_token, expires_in = create_access_token(user.id)
+  return TokenRs(access_token=access_token, expires_in=expires_in)
+
+class AuthService:
+  def __init__(self, db: Session):
+    self.users = UserService(db)
+
+  def login(self, email: str, password: str) -> TokenRs:
+    """
+    Verifica las credenciales y emite un JWT.
+    bcrypt se ejecuta en el pool de procesos de password_hasher, fuera del hilo de la petición.
+    """
+    return issue_token(self.users.verify_credentials(email, password))
+
+
+class AsyncAuthService:
+  """Versión asíncrona de AuthService (AsyncSession + asyncpg)"""
+
+  def __init__(self, db: AsyncSession):
+    self.users = AsyncUserService(db)
+
+  async def login(self, email: str, password: str) -> TokenRs:
+    return issue_token(await self.users.verify_credentials(email, password))
+
+
+def load_principal(user_id: int) -> Optional[PrincipalRs]:
+  with database.SessionLocal() as db:
+    user = UserRepository(db).get_by_id(user_id)
+    return PrincipalRs.model_validate(user) if user else None
+
+async def load_principal_async(user_id: int) -> Optional[PrincipalRs]:
+  async with database.AsyncSessionLocal() as db:
+    user = await AsyncUserRepository(db).get_by_id(user_id)
+    return PrincipalRs.model_validate(user) if user else None
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> PrincipalRs:
+  """
+  Dependencia de autenticación (Authorization: Bearer <token>).
+  Con token y usuario en caché se resuelve en memoria: sin verificar la firma, sin consulta
+  y sin ocupar un hilo ni una conexión del pool. Solo se cachean usuarios activos.
+  """
+  user_id = verify_access_token(token)
+  if user_id is None:
+    raise UnauthorizedError("Token inválido o expirado")
+  principal = principal_cache.get(user_id)
+  if principal is None:
+    if settings.db_mode == "async":
+      principal = await load_principal_async(user_id)
+    else:
+      principal = await run_in_threadpool(load_principal, user_id)
+    if principal is None or not principal.is_active:
+      raise UnauthorizedError("Usuario inexistente o inactivo")
+    principal_cache.set(user_id, principal)
+  return principal
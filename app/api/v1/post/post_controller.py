@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session
-from typing import List
-from app.api.v1.post.post_service import PostService
-from app.api.v1.post.post_schema import PostCreateRq, PostUpdateRq, PostRs, PostsRs
+from typing import List, Optional
+from app.api.v1.post.post_service import PostService, POST_INCLUDES, post_cache_key
+from app.api.v1.post.post_schema import PostCreateRq, PostUpdateRq, PostRs, PostsRs, PostBulkItemRq, PostBulkCreateRs, PostListFilters
 from app.core.database import get_db
-from app.core.response import ApiStatus, ApiResponse
+from app.core.etag import entity_etag, not_modified, weak_etag
+from app.core.include import parse_include
+from app.core.config import get_settings
+from app.core.response import ApiStatus, ApiResponse, fast_success_response
+
+settings = get_settings()
 
 router = APIRouter()
 
@@ -15,18 +20,81 @@ def create_post(post_create: PostCreateRq, user_id: int, db: Session = Depends(g
   post = PostService.create_post(db, post_create, user_id)
   return ApiResponse(status=ApiStatus.SUCCESS, message="Post creado exitosamente", data=post)
 
+# Crear posts de forma masiva
+@router.post("/bulk", response_model=ApiResponse[PostBulkCreateRs], status_code=status.HTTP_201_CREATED,
+             summary="Crear posts de forma masiva",
+             description="Crea varios posts en una sola transacción e informa los errores por elemento")
+def bulk_create_posts(posts: List[PostBulkItemRq], db: Session = Depends(get_db)):
+  result = PostService.bulk_create_posts(db, posts)
+  return ApiResponse(
+    status=ApiStatus.SUCCESS,
+    message=f"{result.total_created} posts creados, {result.total_failed} con errores",
+    data=result
+  )
+
 # Obtener todos los posts
 @router.get("/", response_model=ApiResponse[PostsRs],
-            summary="Listar posts", description="Obtiene todos los posts registrados en el sistema")
-def get_posts(db: Session = Depends(get_db)):
-  posts = PostService.get_all_posts(db)
+            summary="Listar posts",
+            description="Obtiene los posts paginados por offset (skip + limit) o por cursor, "
+                        "con filtros (published, user_id, rangos de event_date y published_at) y orden (sort)")
+def get_posts(
+  request: Request,
+  response: Response,
+  skip: int = Query(0, ge=0, description="Número de registros a saltar (modo offset)"),
+  limit: int = Query(10, ge=1, le=100, description="Cantidad de registros por página"),
+  cursor: Optional[str] = Query(None, description="Cursor `next_cursor` de la página anterior; vacío para la primera página (modo cursor)"),
+  filters: PostListFilters = Depends(),
+  include: Optional[str] = Query(None, description="Relaciones a incluir: author"),
+  db: Session = Depends(get_db),
+):
+  with_author = "author" in parse_include(include, POST_INCLUDES)
+  if cursor is not None:
+    posts = PostService.get_posts_by_cursor(db, cursor, limit, filters, with_author)
+  else:
+    posts = PostService.get_all_posts(db, skip, limit, filters, with_author)
+  # ETag débil del listado: ahorra el envío del cuerpo si la página no cambió
+  # (incluye al autor: su nombre puede cambiar sin que cambie el post)
+  etag = weak_etag(
+    [(post.id, post.updated_at or post.created_at, post.views, post.author) for post in posts.posts]
+    + [posts.total_items, posts.next_cursor]
+  )
+  unchanged = not_modified(request, etag)
+  if unchanged:
+    return unchanged
+  if settings.fast_responses:
+    return fast_success_response("Posts obtenidos correctamente", posts, headers={"ETag": etag})
+  response.headers["ETag"] = etag
   return ApiResponse(status=ApiStatus.SUCCESS, message="Posts obtenidos correctamente", data=posts)
 
 # Obtener un post por ID
 @router.get("/{post_id}", response_model=ApiResponse[PostRs],
             summary="Obtener un post", description="Recupera un post específico usando su ID")
-def get_post(post_id: str, db: Session = Depends(get_db)):
-  post = PostService.get_post(db, post_id)
+def get_post(
+  post_id: str,
+  request: Request,
+  response: Response,
+  include: Optional[str] = Query(None, description="Relaciones a incluir: author"),
+  db: Session = Depends(get_db),
+):
+  with_author = "author" in parse_include(include, POST_INCLUDES)
+  # Con If-None-Match se valida solo con la versión (marcas de tiempo y vistas), sin cargar `content`
+  # (con el autor incluido la validación necesita sus datos, se resuelve más abajo)
+  if request.headers.get("if-none-match") and not with_author:
+    version = PostService.get_post_version(db, post_id)
+    if version:
+      unchanged = not_modified(request, entity_etag(post_cache_key(post_id), *version))
+      if unchanged:
+        return unchanged
+  post = PostService.get_post(db, post_id, with_author)
+  etag = entity_etag(post.id, post.created_at, post.updated_at, post.views)
+  if post.author is not None:
+    etag = weak_etag([etag, post.author.first_name, post.author.last_name])
+    unchanged = not_modified(request, etag)
+    if unchanged:
+      return unchanged
+  if settings.fast_responses:
+    return fast_success_response("Post obtenido correctamente", post, headers={"ETag": etag})
+  response.headers["ETag"] = etag
   return ApiResponse(status=ApiStatus.SUCCESS, message="Post obtenido correctamente", data=post)
 
 # Actualizar un post
@@ -2,7 +2,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import date, datetime
 from uuid import uuid4
-from sqlalchemy import String, Boolean, Integer, Date, TIMESTAMP, ForeignKey, Text
+from sqlalchemy import String, Boolean, Integer, Date, TIMESTAMP, ForeignKey, Text, Index
 from sqlalchemy.dialects.postgresql import UUID, DOUBLE_PRECISION
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
@@ -13,6 +13,10 @@ if TYPE_CHECKING:
 
 class Post(Base):
   __tablename__ = "posts"
+  __table_args__ = (
+    # Índice para la paginación keyset (ORDER BY created_at DESC, id DESC)
+    Index("ix_posts_created_at_id", "created_at", "id"),
+  )
 
   id: Mapped[UUID] = mapped_column(
     UUID(as_uuid=True), 
@@ -23,8 +27,7 @@ class Post(Base):
   user_id: Mapped[int] = mapped_column(
     Integer, 
     ForeignKey("users.id", ondelete="CASCADE"), 
-    nullable=False,
-    index=True
+    nullable=False
   )
   title: Mapped[str] = mapped_column(String(200), nullable=False)
   content: Mapped[str] = mapped_column(Text, nullable=False)
@@ -53,3 +56,26 @@ class Post(Base):
     back_populates="posts",
     lazy="select"
   )
+
+# Índice para la exportación incremental (coalesce(updated_at, created_at) >= :desde)
+Index("ix_posts_modified_at_id", func.coalesce(Post.updated_at, Post.created_at), Post.id)
+
+# Índices del listado filtrado/ordenado (ver PostRepository.get_all).
+# Mismo orden que el ORDER BY (DESC, con NULLS LAST en columnas nulables) para evitar sorts.
+# Posts de un usuario (también cubre la FK en los borrados en cascada)
+Index("ix_posts_user_id_created_at_id", Post.user_id, Post.created_at.desc(), Post.id.desc())
+# Orden por cada clave sin filtro de publicación (created_at usa ix_posts_created_at_id)
+Index("ix_posts_published_at_id", Post.published_at.desc().nulls_last(), Post.id.desc())
+Index("ix_posts_views_id", Post.views.desc(), Post.id.desc())
+Index("ix_posts_rating_id", Post.rating.desc().nulls_last(), Post.id.desc())
+# Feed de publicados: índices parciales WHERE published, uno por clave de orden
+Index("ix_posts_published_feed_published_at", Post.published_at.desc().nulls_last(), Post.id.desc(),
+      postgresql_where=Post.published)
+Index("ix_posts_published_feed_created_at", Post.created_at.desc(), Post.id.desc(),
+      postgresql_where=Post.published)
+Index("ix_posts_published_feed_views", Post.views.desc(), Post.id.desc(),
+      postgresql_where=Post.published)
+Index("ix_posts_published_feed_rating", Post.rating.desc().nulls_last(), Post.id.desc(),
+      postgresql_where=Post.published)
+# Rango de event_date (la mayoría de posts no tiene fecha de evento)
+Index("ix_posts_event_date", Post.event_date, postgresql_where=Post.event_date.is_not(None))
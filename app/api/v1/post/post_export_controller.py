@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from app.api.v1.post.post_export_service import PostExportService
+
+# Se registra en ambos modos (sync/async): el cursor del servidor usa el motor sync
+router = APIRouter()
+
+@router.get("/export", response_class=StreamingResponse,
+            summary="Exportar posts",
+            description="Descarga todos los posts (o los modificados desde una fecha) en NDJSON, opcionalmente con gzip")
+def export_posts(
+  updated_since: Optional[datetime] = Query(None, description="Solo posts creados o modificados desde esta fecha"),
+  gzip: bool = Query(False, description="Comprimir la descarga con gzip"),
+):
+  filename = "posts.ndjson.gz" if gzip else "posts.ndjson"
+  return StreamingResponse(
+    PostExportService.export_ndjson(updated_since, compress=gzip),
+    media_type="application/gzip" if gzip else "application/x-ndjson",
+    headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+  )
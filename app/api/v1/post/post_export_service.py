@@ -0,0 +1,49 @@
+import json
+import zlib
+from datetime import date, datetime
+from typing import Iterator, Optional
+from uuid import UUID
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.api.v1.post.post_repository import PostRepository
+
+settings = get_settings()
+
+# Tamaño aproximado de cada bloque enviado al cliente
+CHUNK_SIZE = 64 * 1024
+
+def _json_default(value):
+  if isinstance(value, (datetime, date)):
+    return value.isoformat()
+  if isinstance(value, UUID):
+    return str(value)
+  raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+class PostExportService:
+  """Exportación completa o incremental de posts en NDJSON (una línea JSON por post)"""
+
+  @staticmethod
+  def export_ndjson(updated_since: Optional[datetime] = None, compress: bool = False) -> Iterator[bytes]:
+    """
+    Genera el archivo por bloques mientras se lee el cursor del servidor.
+    Abre su propia sesión porque se consume después de que el endpoint retorna.
+    """
+    compressor = zlib.compressobj(wbits=31) if compress else None  # wbits=31 -> formato gzip
+    buffer = bytearray()
+
+    with SessionLocal() as db:
+      for row in PostRepository.stream_for_export(db, updated_since, settings.post_export_batch_size):
+        buffer += json.dumps(row._asdict(), default=_json_default, ensure_ascii=False).encode()
+        buffer += b"\n"
+        if len(buffer) >= CHUNK_SIZE:
+          chunk = compressor.compress(bytes(buffer)) if compressor else bytes(buffer)
+          buffer.clear()
+          if chunk:
+            yield chunk
+
+    tail = bytes(buffer)
+    if compressor:
+      tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+      yield tail
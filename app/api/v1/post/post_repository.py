@@ -1,6 +1,61 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import datetime
+from typing import Iterator, List, Optional
+from uuid import UUID
+from sqlalchemy import delete, func, insert, not_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, joinedload
+from app.core.count_cache import count_cache, estimate_rows, estimate_rows_async
 from app.api.v1.post.post_entity import Post
+from app.api.v1.post.post_schema import PostListFilters, PostSortKey
+
+SORT_COLUMNS = {
+  PostSortKey.published_at: Post.published_at,
+  PostSortKey.created_at: Post.created_at,
+  PostSortKey.views: Post.views,
+  PostSortKey.rating: Post.rating,
+}
+
+def build_post_filters(filters: Optional[PostListFilters]) -> list:
+  """Condiciones WHERE del listado según los filtros enviados"""
+  if filters is None:
+    return []
+  conditions = []
+  if filters.published is not None:
+    # `WHERE published` sin parámetro: el planner solo usa los índices parciales
+    # si puede probar la condición, también con sentencias preparadas (asyncpg)
+    conditions.append(Post.published if filters.published else not_(Post.published))
+  if filters.user_id is not None:
+    conditions.append(Post.user_id == filters.user_id)
+  if filters.event_date_from is not None:
+    conditions.append(Post.event_date >= filters.event_date_from)
+  if filters.event_date_to is not None:
+    conditions.append(Post.event_date <= filters.event_date_to)
+  if filters.published_from is not None:
+    conditions.append(Post.published_at >= filters.published_from)
+  if filters.published_to is not None:
+    conditions.append(Post.published_at <= filters.published_to)
+  return conditions
+
+def build_post_order(filters: Optional[PostListFilters]) -> list:
+  """
+  ORDER BY descendente por la clave elegida con `id` como desempate (orden estable).
+  Las columnas nulables van con NULLS LAST, igual que sus índices.
+  """
+  sort = filters.sort if filters is not None else PostSortKey.created_at
+  column = SORT_COLUMNS[sort]
+  order = column.desc().nulls_last() if column.nullable else column.desc()
+  return [order, Post.id.desc()]
+
+def build_post_options(with_author: bool) -> list:
+  """Carga del autor en la misma consulta (many-to-one: JOIN, sin N+1 sobre Post.user)"""
+  return [joinedload(Post.user, innerjoin=True)] if with_author else []
+
+def build_count_key(filters: Optional[PostListFilters]) -> tuple:
+  """Clave de la caché de conteos: solo los filtros (el orden no cambia el total)"""
+  if filters is None:
+    return ()
+  return tuple((name, value) for name, value in filters.model_dump(exclude={"sort"}).items() if value is not None)
 
 class PostRepository:
   @staticmethod
@@ -9,43 +64,256 @@ class PostRepository:
     return db.query(Post).filter(Post.id == post_id).first()
 
   @staticmethod
-  def get_all(db: Session, skip: int = 0, limit: int = 100) -> List[Post]:
-    """Obtiene todos los posts con paginación"""
-    return db.query(Post).offset(skip).limit(limit).all()
+  def get_version(db: Session, post_id: str) -> Optional[tuple[datetime, Optional[datetime], int]]:
+    """Obtiene solo (created_at, updated_at, views) de un post, sin cargar `content`"""
+    return db.query(Post.created_at, Post.updated_at, Post.views).filter(Post.id == post_id).first()
+
+  @staticmethod
+  def get_all(
+    db: Session, skip: int = 0, limit: int = 100, filters: Optional[PostListFilters] = None,
+    with_author: bool = False
+  ) -> List[Post]:
+    """
+    Obtiene los posts con paginación, filtros y orden (por defecto: más recientes primero).
+    Cada combinación de filtro y orden tiene su índice (ver post_entity).
+    - with_author: carga el autor en la misma consulta (JOIN), sin una consulta por post.
+    """
+    return (
+      db.query(Post)
+      .options(*build_post_options(with_author))
+      .filter(*build_post_filters(filters))
+      .order_by(*build_post_order(filters))
+      .offset(skip)
+      .limit(limit)
+      .all()
+    )
+
+  @staticmethod
+  def get_after_cursor(
+    db: Session, after: Optional[tuple[datetime, UUID]], limit: int = 10,
+    filters: Optional[PostListFilters] = None, with_author: bool = False
+  ) -> List[Post]:
+    """
+    Obtiene posts con paginación keyset sobre (created_at, id).
+    Usa el índice ix_posts_created_at_id, por lo que el costo no depende de la profundidad.
+    """
+    query = db.query(Post).options(*build_post_options(with_author)).filter(*build_post_filters(filters))
+    if after is not None:
+      query = query.filter(tuple_(Post.created_at, Post.id) < tuple_(*after))
+    return query.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit).all()
 
   @staticmethod
   def get_by_user(db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Post]:
-    """Obtiene todos los posts de un usuario"""
+    """Obtiene todos los posts de un usuario (más recientes primero, usa ix_posts_user_id_created_at_id)"""
     return (
       db.query(Post)
       .filter(Post.user_id == user_id)
+      .order_by(Post.created_at.desc(), Post.id.desc())
       .offset(skip)
       .limit(limit)
       .all()
     )
 
   @staticmethod
-  def create(db: Session, post: Post) -> Post:
-    """Crea un nuevo post"""
-    db.add(post)
+  def stream_for_export(
+    db: Session, updated_since: Optional[datetime] = None, batch_size: int = 1000
+  ) -> Iterator[Row]:
+    """
+    Recorre los posts con un cursor del lado del servidor (stream_results + yield_per).
+    Devuelve filas de columnas, sin hidratar entidades del ORM, por lo que la memoria
+    es constante sin importar el tamaño de la tabla.
+    - updated_since: solo posts creados o modificados desde esa fecha (exportación incremental).
+    """
+    modified_at = func.coalesce(Post.updated_at, Post.created_at)
+    stmt = select(*Post.__table__.columns)
+    if updated_since is not None:
+      # Usa ix_posts_modified_at_id; el orden permite reanudar desde el último valor exportado
+      stmt = stmt.where(modified_at >= updated_since).order_by(modified_at, Post.id)
+    result = db.execute(stmt.execution_options(stream_results=True, yield_per=batch_size))
+    for partition in result.partitions():
+      yield from partition
+
+  @staticmethod
+  def create(db: Session, values: dict) -> Post:
+    """
+    Crea un nuevo post con un único INSERT ... RETURNING (sin refresh posterior).
+    El post se desvincula antes del commit para que no expire.
+    """
+    post = db.scalars(insert(Post).values(**values).returning(Post)).one()
+    db.expunge(post)
     db.commit()
-    db.refresh(post)
+    count_cache.invalidate("posts")
     return post
 
   @staticmethod
-  def update(db: Session, post: Post) -> Post:
-    """Actualiza un post existente"""
+  def bulk_create(db: Session, rows: List[dict]) -> List[Post]:
+    """
+    Crea varios posts en una sola transacción.
+    Se envía como INSERT ... VALUES (...), (...) RETURNING (insertmanyvalues),
+    devolviendo los posts en el mismo orden que `rows`.
+    """
+    posts = list(db.scalars(insert(Post).returning(Post, sort_by_parameter_order=True), rows))
+    # Se desvinculan antes del commit para que no expiren (evita un SELECT por post)
+    for post in posts:
+      db.expunge(post)
     db.commit()
-    db.refresh(post)
+    count_cache.invalidate("posts")
+    return posts
+
+  @staticmethod
+  def update(db: Session, post_id: str, values: dict) -> Optional[Post]:
+    """
+    Actualiza un post con un único UPDATE ... WHERE id = :id RETURNING (sin SELECT previo ni refresh).
+    Devuelve None si el post no existe. Sin campos a modificar solo se lee la fila actual.
+    """
+    if not values:
+      return PostRepository.get_by_id(db, post_id)
+    post = db.scalars(update(Post).where(Post.id == post_id).values(**values).returning(Post)).one_or_none()
+    if post is None:
+      db.rollback()
+      return None
+    db.expunge(post)
+    db.commit()
+    # published, user_id y las fechas forman parte de las claves de los totales filtrados
+    count_cache.invalidate("posts")
     return post
 
   @staticmethod
-  def delete(db: Session, post: Post) -> None:
-    """Elimina un post"""
-    db.delete(post)
+  def delete(db: Session, post_id: str) -> bool:
+    """Elimina un post con un único DELETE ... RETURNING id. Devuelve False si no existía."""
+    deleted = db.execute(delete(Post).where(Post.id == post_id).returning(Post.id)).first()
+    if deleted is None:
+      db.rollback()
+      return False
     db.commit()
+    count_cache.invalidate("posts")
+    return True
+
+  @staticmethod
+  def count_all(db: Session, filters: Optional[PostListFilters] = None) -> int:
+    """Cuenta los posts que cumplen los filtros (cacheado hasta la próxima escritura o el TTL)"""
+    key = build_count_key(filters)
+    total = count_cache.get("posts", key)
+    if total is None:
+      total = db.query(func.count(Post.id)).filter(*build_post_filters(filters)).scalar()
+      count_cache.set("posts", key, total)
+    return total
+
+  @staticmethod
+  def estimate_all(db: Session) -> Optional[int]:
+    """Total aproximado de posts según pg_class.reltuples (sin recorrer la tabla)"""
+    return estimate_rows(db, Post.__tablename__)
+
+
+class AsyncPostRepository:
+  """Versión asíncrona de PostRepository (AsyncSession + asyncpg)"""
+
+  @staticmethod
+  async def get_by_id(db: AsyncSession, post_id: str) -> Optional[Post]:
+    """Obtiene un post por ID"""
+    result = await db.execute(select(Post).where(Post.id == post_id))
+    return result.scalar_one_or_none()
+
+  @staticmethod
+  async def get_version(db: AsyncSession, post_id: str) -> Optional[tuple[datetime, Optional[datetime], int]]:
+    """Obtiene solo (created_at, updated_at, views) de un post, sin cargar `content`"""
+    result = await db.execute(select(Post.created_at, Post.updated_at, Post.views).where(Post.id == post_id))
+    return result.first()
+
+  @staticmethod
+  async def get_all(
+    db: AsyncSession, skip: int = 0, limit: int = 100, filters: Optional[PostListFilters] = None,
+    with_author: bool = False
+  ) -> List[Post]:
+    """Obtiene los posts con paginación, filtros y orden (por defecto: más recientes primero)"""
+    result = await db.execute(
+      select(Post)
+      .options(*build_post_options(with_author))
+      .where(*build_post_filters(filters))
+      .order_by(*build_post_order(filters))
+      .offset(skip)
+      .limit(limit)
+    )
+    return list(result.scalars().all())
+
+  @staticmethod
+  async def get_after_cursor(
+    db: AsyncSession, after: Optional[tuple[datetime, UUID]], limit: int = 10,
+    filters: Optional[PostListFilters] = None, with_author: bool = False
+  ) -> List[Post]:
+    """Obtiene posts con paginación keyset sobre (created_at, id)"""
+    stmt = select(Post).options(*build_post_options(with_author)).where(*build_post_filters(filters))
+    if after is not None:
+      stmt = stmt.where(tuple_(Post.created_at, Post.id) < tuple_(*after))
+    result = await db.execute(stmt.order_by(Post.created_at.desc(), Post.id.desc()).limit(limit))
+    return list(result.scalars().all())
+
+  @staticmethod
+  async def get_by_user(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Post]:
+    """Obtiene todos los posts de un usuario"""
+    result = await db.execute(
+      select(Post)
+      .where(Post.user_id == user_id)
+      .order_by(Post.created_at.desc(), Post.id.desc())
+      .offset(skip)
+      .limit(limit)
+    )
+    return list(result.scalars().all())
+
+  @staticmethod
+  async def create(db: AsyncSession, values: dict) -> Post:
+    """Crea un nuevo post con un único INSERT ... RETURNING"""
+    post = (await db.scalars(insert(Post).values(**values).returning(Post))).one()
+    await db.commit()
+    count_cache.invalidate("posts")
+    return post
+
+  @staticmethod
+  async def bulk_create(db: AsyncSession, rows: List[dict]) -> List[Post]:
+    """Crea varios posts en una sola transacción (INSERT multi-fila ... RETURNING)"""
+    result = await db.scalars(insert(Post).returning(Post, sort_by_parameter_order=True), rows)
+    posts = list(result)
+    await db.commit()
+    count_cache.invalidate("posts")
+    return posts
+
+  @staticmethod
+  async def update(db: AsyncSession, post_id: str, values: dict) -> Optional[Post]:
+    """Actualiza un post con un único UPDATE ... RETURNING. Devuelve None si no existe."""
+    if not values:
+      return await AsyncPostRepository.get_by_id(db, post_id)
+    result = await db.scalars(update(Post).where(Post.id == post_id).values(**values).returning(Post))
+    post = result.one_or_none()
+    if post is None:
+      await db.rollback()
+      return None
+    await db.commit()
+    count_cache.invalidate("posts")
+    return post
+
+  @staticmethod
+  async def delete(db: AsyncSession, post_id: str) -> bool:
+    """Elimina un post con un único DELETE ... RETURNING id. Devuelve False si no existía."""
+    deleted = (await db.execute(delete(Post).where(Post.id == post_id).returning(Post.id))).first()
+    if deleted is None:
+      await db.rollback()
+      return False
+    await db.commit()
+    count_cache.invalidate("posts")
+    return True
+
+  @staticmethod
+  async def count_all(db: AsyncSession, filters: Optional[PostListFilters] = None) -> int:
+    """Cuenta los posts que cumplen los filtros (cacheado hasta la próxima escritura o el TTL)"""
+    key = build_count_key(filters)
+    total = count_cache.get("posts", key)
+    if total is None:
+      stmt = select(func.count(Post.id)).where(*build_post_filters(filters))
+      total = (await db.execute(stmt)).scalar_one()
+      count_cache.set("posts", key, total)
+    return total
 
   @staticmethod
-  def count_all(db: Session) -> int:
-    """Cuenta el total de posts"""
-    return db.query(Post).count()
\ No newline at end of file
+  async def estimate_all(db: AsyncSession) -> Optional[int]:
+    """Total aproximado de posts según pg_class.reltuples (sin recorrer la tabla)"""
+    return await estimate_rows_async(db, Post.__tablename__)
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import Optional
 from datetime import date, datetime
 from pydantic import BaseModel, Field
@@ -11,6 +12,11 @@ class PostCreateRq(BaseModel):
   event_date: Optional[date] = None
 
 
+# 🔹 Elemento de la creación masiva (incluye el autor de cada post)
+class PostBulkItemRq(PostCreateRq):
+  user_id: int
+
+
 # 🔹 Lo que enviamos al actualizar un Post (todos opcionales)
 class PostUpdateRq(BaseModel):
   title: Optional[str] = Field(None, max_length=200)
@@ -19,6 +25,48 @@ class PostUpdateRq(BaseModel):
   event_date: Optional[date] = None
 
 
+# 🔹 Claves de ordenamiento permitidas en el listado (siempre descendente, cada una con su índice)
+class PostSortKey(str, Enum):
+  published_at = "published_at"
+  created_at = "created_at"
+  views = "views"
+  rating = "rating"
+
+
+# 🔹 Filtros y orden del listado (query params)
+class PostListFilters(BaseModel):
+  published: Optional[bool] = None
+  user_id: Optional[int] = None
+  event_date_from: Optional[date] = None
+  event_date_to: Optional[date] = None
+  published_from: Optional[datetime] = None
+  published_to: Optional[datetime] = None
+  sort: PostSortKey = PostSortKey.created_at
+
+
+# 🔹 Autor de un post (?include=author)
+class PostAuthorRs(BaseModel):
+  id: int
+  first_name: str
+  last_name: str
+
+  class Config:
+    from_attributes = True
+
+
+# 🔹 Resumen de un post, sin `content` (?include=recent_posts en usuarios)
+class PostSummaryRs(BaseModel):
+  id: UUID
+  title: str
+  views: int
+  published: bool
+  published_at: Optional[datetime]
+  created_at: datetime
+
+  class Config:
+    from_attributes = True
+
+
 # 🔹 Lo que devolvemos al cliente (response)
 class PostRs(BaseModel):
   id: UUID
@@ -32,12 +80,27 @@ class PostRs(BaseModel):
   event_date: Optional[date]
   created_at: datetime
   updated_at: Optional[datetime]
+  author: Optional[PostAuthorRs] = None  # Solo con ?include=author
 
   class Config:
     from_attributes = True  # permite convertir desde SQLAlchemy
 
 class PostsRs(BaseModel):
   posts: list[PostRs]
-  current_page: int
-  total_pages: int
-  total_items: int
\ No newline at end of file
+  # En modo cursor no se calcula la paginación clásica (evita el count)
+  current_page: Optional[int] = None
+  total_pages: Optional[int] = None
+  total_items: Optional[int] = None
+  total_is_exact: Optional[bool] = None  # False si total_items es una estimación
+  next_cursor: Optional[str] = None  # None cuando no hay más resultados
+
+# 🔹 Error de un elemento de la creación masiva (index = posición en la lista enviada)
+class PostBulkErrorRs(BaseModel):
+  index: int
+  message: str
+
+class PostBulkCreateRs(BaseModel):
+  created: list[PostRs]
+  errors: list[PostBulkErrorRs]
+  total_created: int
+  total_failed: int
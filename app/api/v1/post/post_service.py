@@ -1,11 +1,142 @@
 import math
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
 from sqlalchemy.orm import Session
-from app.core.error_type import ResourceNotFoundError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.entity_cache import post_cache
+from app.core.error_type import BadRequestError, ResourceNotFoundError
+from app.core.pagination import encode_cursor, decode_cursor
 from app.api.v1.post.post_entity import Post
-from app.api.v1.post.post_repository import PostRepository
-from app.api.v1.user.user_service import UserService
-from app.api.v1.post.post_schema import PostCreateRq, PostUpdateRq, PostRs, PostsRs
+from app.api.v1.post.post_repository import PostRepository, AsyncPostRepository
+from app.api.v1.post.post_view_counter import post_view_counter
+from app.api.v1.user.user_repository import UserRepository, AsyncUserRepository
+from app.api.v1.user.user_service import UserService, AsyncUserService
+from app.api.v1.post.post_schema import (
+  PostCreateRq, PostUpdateRq, PostRs, PostsRs,
+  PostBulkItemRq, PostBulkErrorRs, PostBulkCreateRs,
+  PostListFilters, PostSortKey, PostAuthorRs
+)
+
+settings = get_settings()
+
+# Relaciones que se pueden expandir con ?include=
+POST_INCLUDES = ("author",)
+
+# Campos de PostRs que son columnas de la entidad (author es una expansión opcional)
+POST_RS_FIELDS = tuple(field for field in PostRs.model_fields if field != "author")
+
+def to_post_author_rs(user) -> PostAuthorRs:
+  """Autor a partir de la entidad User o de un UserRs (caché)"""
+  if settings.fast_responses:
+    return PostAuthorRs.model_construct(id=user.id, first_name=user.first_name, last_name=user.last_name)
+  return PostAuthorRs.model_validate(user)
+
+def to_post_rs(post: Post, with_author: bool = False) -> PostRs:
+  """
+  Convierte una entidad a PostRs.
+  Con FAST_RESPONSES las filas del ORM se consideran confiables (ya tipadas por la BD)
+  y se construye el esquema sin validar campo por campo.
+  - with_author: incluye el autor; debe venir precargado (joinedload) para no consultar por post.
+  """
+  author = to_post_author_rs(post.user) if with_author else None
+  if settings.fast_responses:
+    return PostRs.model_construct(**{field: getattr(post, field) for field in POST_RS_FIELDS}, author=author)
+  post_rs = PostRs.model_validate(post)
+  post_rs.author = author
+  return post_rs
+
+def post_cache_key(post_id) -> str:
+  """Normaliza el ID para la caché (el mismo UUID puede llegar con distinto formato)"""
+  try:
+    return str(UUID(str(post_id)))
+  except ValueError:
+    return str(post_id)
+
+def build_posts_page(
+  posts: List[Post], total_posts: int, skip: int, limit: int, total_is_exact: bool = True,
+  with_cursor: bool = True, with_author: bool = False
+) -> PostsRs:
+  """Arma la respuesta paginada por offset"""
+  # Calcular información de paginación
+  current_page = (skip // limit) + 1
+  total_pages = math.ceil(total_posts / limit) if limit > 0 else 1
+  # Convertir posts a PostRs
+  posts_rs = [to_post_rs(post, with_author) for post in posts]
+  # Permite continuar en modo cursor desde cualquier página
+  # Con un total estimado no se puede comparar contra él: basta con una página llena
+  has_more = skip + len(posts) < total_posts if total_is_exact else len(posts) == limit
+  next_cursor = None
+  # El cursor codifica (created_at, id): solo es válido con ese orden
+  if with_cursor and posts and has_more:
+    next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id)
+
+  return PostsRs(
+    posts=posts_rs,
+    current_page=current_page,
+    total_pages=total_pages,
+    total_items=total_posts,
+    total_is_exact=total_is_exact,
+    next_cursor=next_cursor
+  )
+
+def build_posts_cursor_page(posts: List[Post], limit: int, with_author: bool = False) -> PostsRs:
+  """Arma la respuesta paginada por cursor; `posts` trae un registro extra si hay más"""
+  has_more = len(posts) > limit
+  posts = posts[:limit]
+  next_cursor = encode_cursor(posts[-1].created_at, posts[-1].id) if has_more else None
+  return PostsRs(
+    posts=[to_post_rs(post, with_author) for post in posts],
+    next_cursor=next_cursor
+  )
+
+def with_post_author(post_rs: PostRs, author) -> PostRs:
+  """Copia del post con su autor (no modifica la instancia de la caché)"""
+  return post_rs.model_copy(update={"author": to_post_author_rs(author)})
+
+def validate_filters(filters: Optional[PostListFilters], cursor_mode: bool = False) -> None:
+  """Valida los rangos de fechas y que el modo cursor use su orden (created_at)"""
+  if filters is None:
+    return
+  if filters.event_date_from and filters.event_date_to and filters.event_date_from > filters.event_date_to:
+    raise BadRequestError("event_date_from no puede ser posterior a event_date_to")
+  if filters.published_from and filters.published_to and filters.published_from > filters.published_to:
+    raise BadRequestError("published_from no puede ser posterior a published_to")
+  if cursor_mode and filters.sort != PostSortKey.created_at:
+    raise BadRequestError("La paginación por cursor solo admite sort=created_at")
+
+def has_filters(filters: Optional[PostListFilters]) -> bool:
+  return filters is not None and any(
+    value is not None for value in filters.model_dump(exclude={"sort"}).values()
+  )
+
+def validate_bulk_size(items: List[PostBulkItemRq]) -> None:
+  if len(items) > settings.bulk_max_items:
+    raise BadRequestError(f"Se permiten como máximo {settings.bulk_max_items} posts por petición")
+
+def prepare_bulk_rows(
+  items: List[PostBulkItemRq], existing_user_ids: set
+) -> tuple[List[dict], List[PostBulkErrorRs]]:
+  """Separa los elementos válidos (filas a insertar) de los que referencian usuarios inexistentes"""
+  rows, errors = [], []
+  for index, item in enumerate(items):
+    if item.user_id not in existing_user_ids:
+      errors.append(PostBulkErrorRs(index=index, message=f"Usuario con ID {item.user_id} no existe"))
+      continue
+    rows.append(item.model_dump())
+  return rows, errors
+
+def build_bulk_result(created: List[Post], errors: List[PostBulkErrorRs]) -> PostBulkCreateRs:
+  created_rs = [to_post_rs(post) for post in created]
+  for post_rs in created_rs:
+    post_cache.set(post_cache_key(post_rs.id), post_rs)
+  return PostBulkCreateRs(
+    created=created_rs,
+    errors=errors,
+    total_created=len(created_rs),
+    total_failed=len(errors)
+  )
 
 class PostService:
 
@@ -17,7 +148,7 @@ class PostService:
     if not user:
       raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
 
-    new_post = Post(
+    new_post = dict(
       user_id=user_id,
       title=post_create.title,
       content=post_create.content,
@@ -26,59 +157,234 @@ class PostService:
     )
     
     created_post = PostRepository.create(db, new_post)
-    return PostRs.model_validate(created_post)
+    post_rs = to_post_rs(created_post)
+    post_cache.set(post_cache_key(post_rs.id), post_rs)
+    return post_rs
+
+  @staticmethod
+  def bulk_create_posts(db: Session, items: List[PostBulkItemRq]) -> PostBulkCreateRs:
+    """
+    Crea varios posts a la vez.
+    - Valida todos los user_id con una sola consulta.
+    - Inserta los válidos con un único INSERT multi-fila ... RETURNING y un commit.
+    - Los elementos con errores se informan por índice y no impiden crear el resto.
+    """
+    validate_bulk_size(items)
+    existing_user_ids = UserRepository(db).get_existing_ids(item.user_id for item in items) if items else set()
+    rows, errors = prepare_bulk_rows(items, existing_user_ids)
+    created = PostRepository.bulk_create(db, rows) if rows else []
+    return build_bulk_result(created, errors)
 
   @staticmethod
-  def get_all_posts(db: Session, skip: int = 0, limit: int = 10) -> PostsRs:
+  def get_all_posts(
+    db: Session, skip: int = 0, limit: int = 10, filters: Optional[PostListFilters] = None,
+    with_author: bool = False
+  ) -> PostsRs:
     """
     Obtiene posts paginados.
     - Formato: skip + limit
     - skip: número de registros a saltar (offset).
     - limit: número máximo de registros a devolver.
+    - filters: filtros (published, user_id, rangos de fechas) y clave de orden.
+    - with_author: incluye el autor de cada post (misma consulta, sin importar el tamaño de página).
     Para scroll infinito o "cargar más".
     """
+    validate_filters(filters)
     # Obtener los posts paginados
-    posts = PostRepository.get_all(db, skip, limit)
+    posts = PostRepository.get_all(db, skip, limit, filters, with_author)
     # Obtener el total de posts
-    total_posts = PostRepository.count_all(db)
-    # Calcular información de paginación
-    current_page = (skip // limit) + 1
-    total_pages = math.ceil(total_posts / limit) if limit > 0 else 1
-    # Convertir posts a PostRs
-    posts_rs = [PostRs.model_validate(post) for post in posts]
-
-    return PostsRs(
-      posts=posts_rs,
-      current_page=current_page,
-      total_pages=total_pages,
-      total_items=total_posts
+    total_posts, total_is_exact = PostService.count_posts(db, filters)
+    return build_posts_page(
+      posts, total_posts, skip, limit, total_is_exact,
+      with_cursor=filters is None or filters.sort == PostSortKey.created_at,
+      with_author=with_author
     )
+
+  @staticmethod
+  def count_posts(db: Session, filters: Optional[PostListFilters] = None) -> tuple[int, bool]:
+    """
+    Devuelve (total, es_exacto) según COUNT_MODE.
+    En modo estimated usa pg_class.reltuples (solo sin filtros) y cae al conteo exacto si no hay estadísticas.
+    """
+    if settings.count_mode == "estimated" and not has_filters(filters):
+      estimate = PostRepository.estimate_all(db)
+      if estimate is not None:
+        return estimate, False
+    return PostRepository.count_all(db, filters), True
+
+  @staticmethod
+  def get_posts_by_cursor(
+    db: Session, cursor: str = "", limit: int = 10, filters: Optional[PostListFilters] = None,
+    with_author: bool = False
+  ) -> PostsRs:
+    """
+    Obtiene posts paginados por cursor (keyset).
+    - cursor: valor opaco de `next_cursor` de la página anterior ("" para la primera).
+    - limit: número máximo de registros a devolver.
+    - filters: mismos filtros que el modo offset; el orden es siempre created_at.
+    No ejecuta count, por lo que el tiempo es constante sin importar la profundidad.
+    """
+    validate_filters(filters, cursor_mode=True)
+    after = decode_cursor(cursor)
+    # Se pide un registro extra para saber si existe una página siguiente
+    posts = PostRepository.get_after_cursor(db, after, limit + 1, filters, with_author)
+    return build_posts_cursor_page(posts, limit, with_author)
   
   @staticmethod
-  def get_post(db: Session, post_id: str) -> PostRs:
-    post = PostRepository.get_by_id(db, post_id)
-    if not post:
-      raise ResourceNotFoundError("El post no fue encontrado")
-    return PostRs.model_validate(post)
+  def get_post(db: Session, post_id: str, with_author: bool = False) -> PostRs:
+    """
+    Obtiene un post (caché de entidades o BD).
+    - with_author: agrega el autor desde la caché de usuarios o con una consulta por PK.
+    """
+    cache_key = post_cache_key(post_id)
+    post_rs = post_cache.get(cache_key)
+    if post_rs is None:
+      post = PostRepository.get_by_id(db, post_id)
+      if not post:
+        raise ResourceNotFoundError("El post no fue encontrado")
+      post_rs = to_post_rs(post)
+      post_cache.set(cache_key, post_rs)
+    # La vista se acumula en memoria y se escribe por lotes (ver PostViewCounter)
+    post_view_counter.record(cache_key)
+    if with_author:
+      return with_post_author(post_rs, UserService(db).get_user(post_rs.user_id))
+    return post_rs
+
+  @staticmethod
+  def get_post_version(db: Session, post_id: str) -> Optional[tuple[datetime, Optional[datetime], int]]:
+    """
+    Devuelve (created_at, updated_at, views) para validar un ETag.
+    Las vistas se escriben sin tocar `updated_at`, por eso forman parte de la versión.
+    Usa la caché de entidades o, si no está, una consulta que no carga `content`.
+    """
+    cached = post_cache.get(post_cache_key(post_id))
+    if cached is not None:
+      return cached.created_at, cached.updated_at, cached.views
+    return PostRepository.get_version(db, post_id)
 
   @staticmethod
   def update_post(db: Session, post_id: str, post_update: PostUpdateRq) -> PostRs:
-    post = PostRepository.get_by_id(db, post_id)
-    if not post:
-      raise ResourceNotFoundError(f"No se encontró un post con el UUID {post_id}")
-    
-    # Actualizar solo los campos enviados
+    # Actualizar solo los campos enviados, en un único UPDATE ... RETURNING
     update_data = post_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-      setattr(post, field, value)
-
-    updated_post = PostRepository.update(db, post)
+    updated_post = PostRepository.update(db, post_id, update_data)
+    if not updated_post:
+      raise ResourceNotFoundError(f"No se encontró un post con el UUID {post_id}")
     # Transformar a esquema de respuesta
-    return PostRs.model_validate(updated_post)
+    post_rs = to_post_rs(updated_post)
+    post_cache.set(post_cache_key(post_id), post_rs)
+    return post_rs
 
   @staticmethod
   def delete_post(db: Session, post_id: str) -> None:
-    post = PostRepository.get_by_id(db, post_id)
-    if not post:
+    if not PostRepository.delete(db, post_id):
+      raise ResourceNotFoundError("El post no fue encontrado")
+    post_cache.invalidate(post_cache_key(post_id))
+
+
+class AsyncPostService:
+  """Versión asíncrona de PostService (AsyncSession + asyncpg)"""
+
+  @staticmethod
+  async def create_post(db: AsyncSession, post_create: PostCreateRq, user_id: int) -> PostRs:
+    # Lanza ResourceNotFoundError si el usuario no existe
+    await AsyncUserService(db).get_user(user_id)
+
+    new_post = dict(
+      user_id=user_id,
+      title=post_create.title,
+      content=post_create.content,
+      published=post_create.published,
+      event_date=post_create.event_date
+    )
+
+    created_post = await AsyncPostRepository.create(db, new_post)
+    post_rs = to_post_rs(created_post)
+    post_cache.set(post_cache_key(post_rs.id), post_rs)
+    return post_rs
+
+  @staticmethod
+  async def bulk_create_posts(db: AsyncSession, items: List[PostBulkItemRq]) -> PostBulkCreateRs:
+    """Crea varios posts con una validación de usuarios y un único INSERT multi-fila"""
+    validate_bulk_size(items)
+    existing_user_ids = (
+      await AsyncUserRepository(db).get_existing_ids(item.user_id for item in items) if items else set()
+    )
+    rows, errors = prepare_bulk_rows(items, existing_user_ids)
+    created = await AsyncPostRepository.bulk_create(db, rows) if rows else []
+    return build_bulk_result(created, errors)
+
+  @staticmethod
+  async def get_all_posts(
+    db: AsyncSession, skip: int = 0, limit: int = 10, filters: Optional[PostListFilters] = None,
+    with_author: bool = False
+  ) -> PostsRs:
+    """Obtiene posts paginados (skip + limit) con filtros, orden y autor opcional"""
+    validate_filters(filters)
+    posts = await AsyncPostRepository.get_all(db, skip, limit, filters, with_author)
+    total_posts, total_is_exact = await AsyncPostService.count_posts(db, filters)
+    return build_posts_page(
+      posts, total_posts, skip, limit, total_is_exact,
+      with_cursor=filters is None or filters.sort == PostSortKey.created_at,
+      with_author=with_author
+    )
+
+  @staticmethod
+  async def count_posts(db: AsyncSession, filters: Optional[PostListFilters] = None) -> tuple[int, bool]:
+    """Devuelve (total, es_exacto) según COUNT_MODE; la estimación solo aplica sin filtros"""
+    if settings.count_mode == "estimated" and not has_filters(filters):
+      estimate = await AsyncPostRepository.estimate_all(db)
+      if estimate is not None:
+        return estimate, False
+    return await AsyncPostRepository.count_all(db, filters), True
+
+  @staticmethod
+  async def get_posts_by_cursor(
+    db: AsyncSession, cursor: str = "", limit: int = 10, filters: Optional[PostListFilters] = None,
+    with_author: bool = False
+  ) -> PostsRs:
+    """Obtiene posts paginados por cursor (keyset) con filtros"""
+    validate_filters(filters, cursor_mode=True)
+    after = decode_cursor(cursor)
+    posts = await AsyncPostRepository.get_after_cursor(db, after, limit + 1, filters, with_author)
+    return build_posts_cursor_page(posts, limit, with_author)
+
+  @staticmethod
+  async def get_post(db: AsyncSession, post_id: str, with_author: bool = False) -> PostRs:
+    """Obtiene un post (caché o BD) con el autor opcional"""
+    cache_key = post_cache_key(post_id)
+    post_rs = post_cache.get(cache_key)
+    if post_rs is None:
+      post = await AsyncPostRepository.get_by_id(db, post_id)
+      if not post:
+        raise ResourceNotFoundError("El post no fue encontrado")
+      post_rs = to_post_rs(post)
+      post_cache.set(cache_key, post_rs)
+    # La vista se acumula en memoria y se escribe por lotes (ver PostViewCounter)
+    post_view_counter.record(cache_key)
+    if with_author:
+      return with_post_author(post_rs, await AsyncUserService(db).get_user(post_rs.user_id))
+    return post_rs
+
+  @staticmethod
+  async def get_post_version(db: AsyncSession, post_id: str) -> Optional[tuple[datetime, Optional[datetime], int]]:
+    """Devuelve (created_at, updated_at, views) para validar un ETag, sin cargar `content`"""
+    cached = post_cache.get(post_cache_key(post_id))
+    if cached is not None:
+      return cached.created_at, cached.updated_at, cached.views
+    return await AsyncPostRepository.get_version(db, post_id)
+
+  @staticmethod
+  async def update_post(db: AsyncSession, post_id: str, post_update: PostUpdateRq) -> PostRs:
+    update_data = post_update.model_dump(exclude_unset=True)
+    updated_post = await AsyncPostRepository.update(db, post_id, update_data)
+    if not updated_post:
+      raise ResourceNotFoundError(f"No se encontró un post con el UUID {post_id}")
+    post_rs = to_post_rs(updated_post)
+    post_cache.set(post_cache_key(post_id), post_rs)
+    return post_rs
+
+  @staticmethod
+  async def delete_post(db: AsyncSession, post_id: str) -> None:
+    if not await AsyncPostRepository.delete(db, post_id):
       raise ResourceNotFoundError("El post no fue encontrado")
-    PostRepository.delete(db, post)
\ No newline at end of file
+    post_cache.invalidate(post_cache_key(post_id))
@@ -0,0 +1,120 @@
+import asyncio
+import threading
+from collections import Counter
+from typing import Optional
+from uuid import UUID
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from starlette.concurrency import run_in_threadpool
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.entity_cache import post_cache
+from app.api.v1.post.post_entity import Post
+
+settings = get_settings()
+
+posts_table = Post.__table__
+
+class PostViewCounter:
+  """
+  Conteo de vistas con escritura diferida (write-behind).
+  Las vistas se acumulan en memoria por post y se escriben periódicamente con un único
+  UPDATE ... FROM (VALUES ...), evitando un UPDATE por lectura y el bloqueo de filas populares.
+  Si el proceso termina abruptamente se pierden las vistas aún no escritas.
+  Tras escribir un lote se descartan esos posts de la caché de entidades, así la próxima
+  lectura devuelve las vistas actualizadas y su ETag (que incluye las vistas) cambia.
+  """
+
+  def __init__(self, enabled: bool, flush_interval_seconds: float, max_batch: int):
+    self.enabled = enabled
+    self.flush_interval_seconds = flush_interval_seconds
+    self.max_batch = max_batch
+    self._pending: Counter = Counter()
+    self._lock = threading.Lock()
+    self._task: Optional[asyncio.Task] = None
+    self.flushed_views = 0
+    self.failed_flushes = 0
+
+  def record(self, post_id: str) -> None:
+    if self.enabled:
+      with self._lock:
+        self._pending[post_id] += 1
+
+  def flush(self) -> int:
+    """Escribe las vistas acumuladas; devuelve cuántas se escribieron"""
+    with self._lock:
+      pending, self._pending = self._pending, Counter()
+    if not pending:
+      return 0
+
+    # Orden por ID: todos los procesos bloquean las filas en el mismo orden (sin deadlocks)
+    items = sorted(pending.items())
+    written = 0
+    start = 0
+    try:
+      with SessionLocal() as db:
+        for start in range(0, len(items), self.max_batch):
+          batch = items[start:start + self.max_batch]
+          increments = values(
+            column("id", PG_UUID(as_uuid=True)), column("delta", Integer), name="increments"
+          ).data([(UUID(post_id), delta) for post_id, delta in batch])
+          db.execute(
+            update(posts_table)
+            .where(posts_table.c.id == increments.c.id)
+            # updated_at se asigna a sí mismo para que el onupdate no lo cambie:
+            # una vista no es una edición del post
+            .values(views=posts_table.c.views + increments.c.delta, updated_at=posts_table.c.updated_at)
+          )
+          db.commit()
+          for post_id, _ in batch:
+            post_cache.invalidate(post_id)
+          written += sum(delta for _, delta in batch)
+    except Exception as e:
+      self.failed_flushes += 1
+      print(f"❌ Error al escribir vistas de posts: {e}")
+      # Los lotes no escritos vuelven al buffer para el siguiente ciclo
+      with self._lock:
+        self._pending.update(dict(items[start:]))
+    self.flushed_views += written
+    return written
+
+  async def _run(self) -> None:
+    while True:
+      await asyncio.sleep(self.flush_interval_seconds)
+      await run_in_threadpool(self.flush)
+
+  def start(self) -> None:
+    """Inicia la escritura periódica (se llama desde el lifespan)"""
+    if self.enabled and self._task is None:
+      self._task = asyncio.create_task(self._run())
+
+  async def stop(self) -> None:
+    """Detiene la tarea periódica y escribe lo pendiente"""
+    if self._task is not None:
+      self._task.cancel()
+      try:
+        await self._task
+      except asyncio.CancelledError:
+        pass
+      self._task = None
+    await run_in_threadpool(self.flush)
+
+  def stats(self) -> dict:
+    with self._lock:
+      pending_posts = len(self._pending)
+      pending_views = sum(self._pending.values())
+    return {
+      "enabled": self.enabled,
+      "pending_posts": pending_posts,
+      "pending_views": pending_views,
+      "flushed_views": self.flushed_views,
+      "failed_flushes": self.failed_flushes,
+    }
+
+
+# Instancia compartida por PostService
+post_view_counter = PostViewCounter(
+  enabled=settings.post_views_enabled,
+  flush_interval_seconds=settings.post_views_flush_interval_seconds,
+  max_batch=settings.post_views_flush_max_batch,
+)
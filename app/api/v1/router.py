@@ -1,8 +1,24 @@
 from fastapi import APIRouter
-from app.api.v1.user.user_controller import router as user_router
-from app.api.v1.post.post_controller import router as post_router
+from app.core.config import get_settings
+from app.api.v1.user.user_import_controller import router as user_import_router
+from app.api.v1.post.post_export_controller import router as post_export_router
+
+settings = get_settings()
+
+# DB_MODE decide qué implementación de los controladores se registra (sync o async)
+if settings.db_mode == "async":
+  from app.api.v1.user.user_async_controller import router as user_router
+  from app.api.v1.post.post_async_controller import router as post_router
+  from app.api.v1.auth.auth_async_controller import router as auth_router
+else:
+  from app.api.v1.user.user_controller import router as user_router
+  from app.api.v1.post.post_controller import router as post_router
+  from app.api.v1.auth.auth_controller import router as auth_router
 
 router = APIRouter()
 
+router.include_router(auth_router, prefix="/auth", tags=["auth"])
+router.include_router(user_import_router, prefix="/users", tags=["users"])
 router.include_router(user_router, prefix="/users", tags=["users"])
+router.include_router(post_export_router, prefix="/posts", tags=["posts"])
 router.include_router(post_router, prefix="/posts", tags=["posts"])
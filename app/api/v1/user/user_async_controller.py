@@ -0,0 +1,108 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from app.api.v1.user.user_service import AsyncUserService, USER_INCLUDES
+from app.api.v1.user.user_schema import UserCreateRq, UserUpdateRq, UserPatchRq, UserRs, UsersRs
+from app.api.v1.user.user_purge import user_purger
+from app.core.database import get_async_db
+from app.core.etag import entity_etag, not_modified, weak_etag
+from app.core.include import parse_include
+from app.core.response import ApiStatus, ApiResponse, fast_success_response
+
+# Mismos endpoints que user_controller, ejecutados en el event loop (DB_MODE=async)
+router = APIRouter()
+
+# Inyección de dependencia del servicio
+def get_user_service(db: AsyncSession = Depends(get_async_db)) -> AsyncUserService:
+  return AsyncUserService(db)
+
+@router.post("/", response_model=ApiResponse[UserRs], status_code=status.HTTP_201_CREATED,
+             summary="Crear un nuevo usuario", description="Crea un usuario en el sistema")
+async def create_user(user_create: UserCreateRq, service: AsyncUserService = Depends(get_user_service)):
+  user = await service.create_user(user_create)
+  return ApiResponse(status=ApiStatus.SUCCESS, message="Usuario creado exitosamente", data=user)
+
+@router.get("/", response_model=ApiResponse[UsersRs],
+            summary="Listar usuarios", description="Obtiene la lista de usuarios con paginación y búsqueda")
+async def get_users(
+  request: Request,
+  response: Response,
+  page: int = Query(1, ge=1, description="Número de página (1-based)"),
+  limit: int = Query(10, ge=1, le=100, description="Cantidad de registros por página"),
+  search: str = Query("", description="Texto de búsqueda opcional"),
+  sort: Literal["recent", "relevance"] = Query("recent", description="Orden: más recientes o relevancia de la búsqueda"),
+  include: Optional[str] = Query(None, description="Relaciones a incluir: recent_posts"),
+  service: AsyncUserService = Depends(get_user_service),
+):
+  with_recent_posts = "recent_posts" in parse_include(include, USER_INCLUDES)
+  users = await service.get_users_paginated(
+    page=page, limit=limit, search=search, sort=sort, with_recent_posts=with_recent_posts
+  )
+  # ETag débil del listado: ahorra el envío del cuerpo si la página no cambió
+  etag = weak_etag(
+    [(user.id, user.name, user.email, user.posts_count, user.recent_posts) for user in users.users]
+    + [users.total_items]
+  )
+  unchanged = not_modified(request, etag)
+  if unchanged:
+    return unchanged
+  response.headers["ETag"] = etag
+  return ApiResponse(
+    status=ApiStatus.SUCCESS,
+    message="Usuarios obtenidos correctamente",
+    data=users
+  )
+
+@router.get("/{user_id}", response_model=ApiResponse[UserRs],
+            summary="Obtener usuario por ID", description="Recupera un usuario específico usando su ID")
+async def get_user(
+  user_id: int,
+  request: Request,
+  response: Response,
+  include: Optional[str] = Query(None, description="Relaciones a incluir: recent_posts"),
+  service: AsyncUserService = Depends(get_user_service),
+):
+  with_recent_posts = "recent_posts" in parse_include(include, USER_INCLUDES)
+  # Con If-None-Match se valida solo con las marcas de tiempo
+  # (con los posts incluidos la validación necesita sus datos, se resuelve más abajo)
+  if request.headers.get("if-none-match") and not with_recent_posts:
+    version = await service.get_user_version(user_id)
+    if version:
+      unchanged = not_modified(request, entity_etag(user_id, *version))
+      if unchanged:
+        return unchanged
+  user = await service.get_user(user_id, with_recent_posts)
+  etag = entity_etag(user.id, user.created_at, user.updated_at)
+  if user.recent_posts is not None:
+    etag = weak_etag([etag, user.recent_posts])
+    unchanged = not_modified(request, etag)
+    if unchanged:
+      return unchanged
+  response.headers["ETag"] = etag
+  return ApiResponse(status=ApiStatus.SUCCESS, message="Usuario obtenido correctamente", data=user)
+
+@router.put("/{user_id}", response_model=ApiResponse[UserRs],
+            summary="Actualizar usuario", description="Modifica los datos de un usuario existente")
+async def update_user(user_id: int, user_update: UserUpdateRq, service: AsyncUserService = Depends(get_user_service)):
+  updated_user = await service.update_user(user_id, user_update)
+  return ApiResponse(status=ApiStatus.SUCCESS, message="Usuario actualizado exitosamente", data=updated_user)
+
+@router.patch("/{user_id}", response_model=ApiResponse[UserRs],
+              summary="Actualizar usuario parcialmente",
+              description="Modifica solo los campos enviados; la contraseña se re-hashea solo si cambia")
+async def patch_user(user_id: int, user_patch: UserPatchRq, service: AsyncUserService = Depends(get_user_service)):
+  updated_user = await service.update_user(user_id, user_patch)
+  return ApiResponse(status=ApiStatus.SUCCESS, message="Usuario actualizado exitosamente", data=updated_user)
+
+@router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT,
+               responses={status.HTTP_202_ACCEPTED: {
+                 "model": ApiResponse[None], "description": "Cuenta desactivada; la purga continúa en segundo plano"
+               }},
+               summary="Eliminar usuario",
+               description="Elimina un usuario y sus posts. Las cuentas con muchos posts se desactivan "
+                           "y se purgan por lotes en segundo plano (202 Accepted)")
+async def delete_user(user_id: int, background_tasks: BackgroundTasks, service: AsyncUserService = Depends(get_user_service)):
+  if not await service.delete_user(user_id):
+    background_tasks.add_task(user_purger.purge, user_id)
+    return fast_success_response("Eliminación del usuario programada", status_code=status.HTTP_202_ACCEPTED)
+  return
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING
 from datetime import date, datetime
-from sqlalchemy import Integer, String, Boolean, Date, TIMESTAMP
+from sqlalchemy import Integer, String, Boolean, Date, TIMESTAMP, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.database import Base 
@@ -11,6 +11,15 @@ if TYPE_CHECKING:
 
 class User(Base):
   __tablename__ = "users"
+  __table_args__ = (
+    # Índices trigram (pg_trgm) para la búsqueda ILIKE '%term%'
+    Index("ix_users_first_name_trgm", "first_name", postgresql_using="gin",
+          postgresql_ops={"first_name": "gin_trgm_ops"}),
+    Index("ix_users_last_name_trgm", "last_name", postgresql_using="gin",
+          postgresql_ops={"last_name": "gin_trgm_ops"}),
+    Index("ix_users_email_trgm", "email", postgresql_using="gin",
+          postgresql_ops={"email": "gin_trgm_ops"}),
+  )
 
   id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
   email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
@@ -29,6 +38,8 @@ class User(Base):
   )
 
   # Relación UNO-a-muchos
+  # passive_deletes: el borrado de los posts queda a cargo del ON DELETE CASCADE de la FK,
+  # sin cargar en la sesión los posts del usuario al eliminarlo
   posts: Mapped[list["Post"]] = relationship(
-    "Post", back_populates="user", cascade="all, delete-orphan"
+    "Post", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
   )
\ No newline at end of file
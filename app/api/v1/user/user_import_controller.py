@@ -0,0 +1,33 @@
+import io
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, File, Query, UploadFile, status
+from sqlalchemy.orm import Session
+from app.api.v1.user.user_import_service import UserImportService, detect_format, print_progress
+from app.api.v1.user.user_schema import UserImportRs
+from app.core.database import get_db
+from app.core.response import ApiStatus, ApiResponse
+
+# Se registra en ambos modos (sync/async): COPY usa la conexión psycopg2 del motor sync
+router = APIRouter()
+
+@router.post("/import", response_model=ApiResponse[UserImportRs], status_code=status.HTTP_200_OK,
+             summary="Importar usuarios",
+             description="Importa usuarios desde un archivo CSV o NDJSON en lotes (COPY + merge)")
+def import_users(
+  file: UploadFile = File(..., description="Archivo CSV (con encabezado) o NDJSON"),
+  format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Formato; por defecto según la extensión"),
+  db: Session = Depends(get_db),
+):
+  # El archivo se lee en streaming desde el temporal de la subida
+  stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+  try:
+    result = UserImportService(db).import_stream(
+      stream, format or detect_format(file.filename), on_progress=print_progress
+    )
+  finally:
+    stream.detach()
+  return ApiResponse(
+    status=ApiStatus.SUCCESS,
+    message=f"Importación finalizada: {result.inserted} usuarios creados",
+    data=result
+  )
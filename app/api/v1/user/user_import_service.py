@@ -0,0 +1,159 @@
+import csv
+import json
+import time
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+from app.core.password_hasher import password_hasher
+from app.api.v1.user.user_repository import UserRepository
+from app.api.v1.user.user_schema import UserCreateRq, UserImportErrorRs, UserImportRs
+
+settings = get_settings()
+
+MAX_REPORTED_ERRORS = 100
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Union[dict, str]]]:
+  """
+  Recorre el archivo fila por fila (sin cargarlo completo) y devuelve (línea, registro sin procesar).
+  - csv: primera fila con los nombres de columna; cada registro ya es un dict.
+  - ndjson: un objeto JSON por línea; se devuelve el texto (ver parse_record).
+  """
+  if fmt == "csv":
+    reader = csv.DictReader(stream)
+    for record in reader:
+      yield reader.line_num, record
+  else:
+    for line_num, line in enumerate(stream, start=1):
+      if line.strip():
+        yield line_num, line
+
+def parse_record(raw: Union[dict, str]) -> dict:
+  """
+  Registro de una línea como dict. Una línea NDJSON mal formada o que no es un objeto
+  lanza ValueError: es un error de esa línea, no de todo el archivo.
+  """
+  if isinstance(raw, dict):
+    return raw
+  try:
+    record = json.loads(raw)
+  except json.JSONDecodeError as e:
+    raise ValueError(f"JSON inválido: {e}") from e
+  if not isinstance(record, dict):
+    raise ValueError(f"Se esperaba un objeto JSON, se recibió {type(record).__name__}")
+  return record
+
+def detect_format(filename: Optional[str]) -> str:
+  return "ndjson" if filename and filename.lower().endswith((".ndjson", ".jsonl")) else "csv"
+
+
+class UserImportService:
+  """
+  Importación masiva de usuarios en lotes:
+  validación -> deduplicación contra la tabla -> hash en paralelo -> COPY + merge.
+  """
+
+  def __init__(self, db: Session, batch_size: Optional[int] = None):
+    self.repo = UserRepository(db)
+    self.batch_size = batch_size or settings.user_import_batch_size
+
+  def import_stream(
+    self, stream: TextIO, fmt: str, on_progress: Optional[Callable[[UserImportRs], None]] = None
+  ) -> UserImportRs:
+    result = UserImportRs()
+    started = time.perf_counter()
+    batch: List[Tuple[int, UserCreateRq]] = []
+
+    try:
+      for line_num, raw in iter_records(stream, fmt):
+        result.processed += 1
+        try:
+          record = parse_record(raw)
+          # En CSV las columnas vacías equivalen a valores no enviados
+          batch.append((line_num, UserCreateRq(**{k: v for k, v in record.items() if v != ""})))
+        except (ValidationError, TypeError, ValueError) as e:
+          self._add_error(result, line_num, str(e).splitlines()[0])
+        if len(batch) >= self.batch_size:
+          self._import_batch(batch, result, started, on_progress)
+          batch = []
+    except (csv.Error, UnicodeDecodeError) as e:
+      # Archivo corrupto: se conserva lo importado hasta aquí
+      self._add_error(result, result.processed + 1, f"Archivo inválido: {e}")
+
+    if batch:
+      self._import_batch(batch, result, started, on_progress)
+    self._update_throughput(result, started)
+    return result
+
+  def _import_batch(
+    self,
+    batch: List[Tuple[int, UserCreateRq]],
+    result: UserImportRs,
+    started: float,
+    on_progress: Optional[Callable[[UserImportRs], None]],
+  ) -> None:
+    # Duplicados dentro del lote
+    unique: dict = {}
+    for line_num, user in batch:
+      if user.email in unique:
+        result.duplicated_in_file += 1
+      else:
+        unique[user.email] = user
+
+    # Emails ya registrados (incluye los de lotes anteriores del mismo archivo): no se hashean
+    existing = self.repo.get_existing_emails(unique.keys())
+    result.skipped_existing += len(existing)
+    users = [user for email, user in unique.items() if email not in existing]
+
+    if users:
+      hashes = password_hasher.hash_many([user.password for user in users])
+      rows = [
+        (user.email, hashed, user.first_name, user.last_name, user.role.value,
+         user.is_active if user.is_active is not None else True, user.birth_date)
+        for user, hashed in zip(users, hashes)
+      ]
+      inserted = self.repo.copy_import_batch(rows)
+      result.inserted += inserted
+      # Emails insertados por otra petición entre la consulta y el merge
+      result.skipped_existing += len(rows) - inserted
+
+    self._update_throughput(result, started)
+    if on_progress:
+      on_progress(result)
+
+  @staticmethod
+  def _add_error(result: UserImportRs, line_num: int, message: str) -> None:
+    result.invalid += 1
+    if len(result.errors) < MAX_REPORTED_ERRORS:
+      result.errors.append(UserImportErrorRs(line=line_num, message=message))
+
+  @staticmethod
+  def _update_throughput(result: UserImportRs, started: float) -> None:
+    result.elapsed_seconds = round(time.perf_counter() - started, 3)
+    result.rows_per_second = round(result.processed / result.elapsed_seconds, 1) if result.elapsed_seconds else 0.0
+
+
+def print_progress(result: UserImportRs) -> None:
+  print(
+    f"📥 Importación: {result.processed} procesados, {result.inserted} insertados, "
+    f"{result.skipped_existing} existentes, {result.invalid} inválidos "
+    f"({result.rows_per_second} filas/s)"
+  )
+
+
+if __name__ == "__main__":
+  # Uso: python -m app.api.v1.user.user_import_service usuarios.csv [--format csv|ndjson]
+  import argparse
+  from app.core.database import SessionLocal
+
+  parser = argparse.ArgumentParser(description="Importa usuarios desde un archivo CSV o NDJSON")
+  parser.add_argument("path")
+  parser.add_argument("--format", choices=["csv", "ndjson"], default=None)
+  parser.add_argument("--batch-size", type=int, default=None)
+  args = parser.parse_args()
+
+  with SessionLocal() as db, open(args.path, encoding="utf-8-sig", newline="") as file:
+    service = UserImportService(db, batch_size=args.batch_size)
+    summary = service.import_stream(file, args.format or detect_format(args.path), on_progress=print_progress)
+  password_hasher.shutdown()
+  print(summary.model_dump_json(indent=2))
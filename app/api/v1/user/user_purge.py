@@ -0,0 +1,78 @@
+import threading
+from typing import Set
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.entity_cache import post_cache, user_cache
+from app.core.security import invalidate_principal
+from app.api.v1.user.user_repository import UserRepository
+
+settings = get_settings()
+
+class UserPurger:
+  """
+  Eliminación diferida de cuentas con muchos posts.
+  Los posts se borran por lotes (un DELETE y un commit por lote) y al final el usuario,
+  así ninguna transacción bloquea miles de filas ni crece el WAL de una sola vez.
+  Se ejecuta fuera de la petición (BackgroundTasks); si el proceso termina a mitad,
+  el usuario queda inactivo con parte de sus posts y un nuevo DELETE retoma la purga.
+  """
+
+  def __init__(self, async_threshold: int, chunk_size: int):
+    self.async_threshold = async_threshold
+    self.chunk_size = chunk_size
+    self._in_progress: Set[int] = set()
+    self._lock = threading.Lock()
+    self.purged_users = 0
+    self.purged_posts = 0
+    self.failed_purges = 0
+
+  def should_defer(self, posts_count: int) -> bool:
+    """Indica si la cuenta supera el umbral de purga en segundo plano"""
+    return posts_count > self.async_threshold
+
+  def purge(self, user_id: int) -> None:
+    with self._lock:
+      if user_id in self._in_progress:
+        return
+      self._in_progress.add(user_id)
+    deleted_posts = 0
+    try:
+      with SessionLocal() as db:
+        repo = UserRepository(db)
+        while True:
+          deleted = repo.delete_posts_chunk(user_id, self.chunk_size)
+          deleted_posts += deleted
+          if deleted < self.chunk_size:
+            break
+        # Los posts creados durante la purga se eliminan por el ON DELETE CASCADE
+        repo.delete(user_id)
+      self.purged_users += 1
+      print(f"🗑️ Usuario {user_id} purgado ({deleted_posts} posts)")
+    except Exception as e:
+      self.failed_purges += 1
+      print(f"❌ Error al purgar el usuario {user_id}: {e}")
+    finally:
+      self.purged_posts += deleted_posts
+      with self._lock:
+        self._in_progress.discard(user_id)
+      user_cache.invalidate(user_id)
+      invalidate_principal(user_id)
+      post_cache.clear()
+
+  def stats(self) -> dict:
+    with self._lock:
+      in_progress = len(self._in_progress)
+    return {
+      "async_threshold": self.async_threshold,
+      "in_progress": in_progress,
+      "purged_users": self.purged_users,
+      "purged_posts": self.purged_posts,
+      "failed_purges": self.failed_purges,
+    }
+
+
+# Instancia compartida por los controladores de usuarios
+user_purger = UserPurger(
+  async_threshold=settings.user_purge_async_threshold,
+  chunk_size=settings.user_purge_chunk_size,
+)
@@ -1,12 +1,101 @@
-from sqlalchemy import func
+from datetime import datetime
+import csv
+import io
+from sqlalchemy import delete, func, insert, or_, select, text, true, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from app.core.count_cache import count_cache, estimate_rows, estimate_rows_async
 from app.api.v1.post.post_entity import Post
 from app.api.v1.user.user_entity import User
-from typing import Optional, List
+from typing import Iterable, Optional, List, Set, Tuple
 from pydantic import EmailStr
 
 from app.api.v1.user.user_schema import UserWithPostsCountRs
 
+# Columnas buscables; cada una tiene un índice GIN trigram (ver user_entity)
+SEARCH_COLUMNS = (User.first_name, User.last_name, User.email)
+
+# Columnas cargadas por la importación masiva (mismo orden que las filas de COPY)
+IMPORT_COLUMNS = ("email", "password", "first_name", "last_name", "role", "is_active", "birth_date")
+
+def build_search_filter(search: str):
+  """
+  Filtro de búsqueda por subcadena compartido por listados y conteos.
+  ILIKE '%term%' usa los índices gin_trgm_ops, evitando el seq scan.
+  Los comodines del usuario (% y _) se escapan para buscarse de forma literal.
+  """
+  escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+  pattern = f"%{escaped}%"
+  return or_(*(column.ilike(pattern, escape="\\") for column in SEARCH_COLUMNS))
+
+def build_search_rank(search: str):
+  """Relevancia de la coincidencia (0..1) según pg_trgm, para ordenar resultados"""
+  return func.greatest(*(func.word_similarity(search, column) for column in SEARCH_COLUMNS))
+
+def build_search_order(search: str, by_relevance: bool) -> tuple:
+  """Orden del listado: relevancia (si se pide y hay búsqueda) y luego los más recientes"""
+  if search and by_relevance:
+    return (build_search_rank(search).desc(), User.id.desc())
+  return (User.id.desc(),)
+
+def build_page_with_total_stmt(page: int, limit: int, search: str = "", by_relevance: bool = False):
+  """
+  Página de usuarios + conteo de posts + total en una sola consulta.
+  - La subconsulta pagina sobre `users` y calcula el total con count(*) OVER ().
+  - El conteo de posts se resuelve solo para las filas de la página (índice posts.user_id).
+  Devuelve filas (User, total_items, posts_count).
+  """
+  skip = (page - 1) * limit
+  page_query = select(User.id, func.count().over().label("total_items"))
+  if search:
+    page_query = page_query.where(build_search_filter(search))
+  page_rows = (
+    page_query.order_by(*build_search_order(search, by_relevance))
+    .offset(skip)
+    .limit(limit)
+    .subquery()
+  )
+  posts_count = (
+    select(func.count(Post.id))
+    .where(Post.user_id == User.id)
+    .correlate(User)
+    .scalar_subquery()
+    .label("posts_count")
+  )
+  return (
+    select(User, page_rows.c.total_items, posts_count)
+    .join(page_rows, page_rows.c.id == User.id)
+    .order_by(*build_search_order(search, by_relevance))
+  )
+
+def build_recent_posts_stmt(user_ids: Iterable[int], limit: int):
+  """
+  Últimos `limit` posts de cada usuario en una sola consulta (JOIN LATERAL top-N).
+  Cada subconsulta lateral recorre ix_posts_user_id_created_at_id y se detiene a los
+  `limit` registros, por lo que el costo no depende de cuántos posts tenga cada usuario.
+  """
+  recent = (
+    select(Post.id, Post.user_id, Post.title, Post.views, Post.published, Post.published_at, Post.created_at)
+    .where(Post.user_id == User.id)
+    .order_by(Post.created_at.desc(), Post.id.desc())
+    .limit(limit)
+    .lateral("recent_posts")
+  )
+  return (
+    select(recent)
+    .select_from(User)
+    .join(recent, true())
+    .where(User.id.in_(list(user_ids)))
+    .order_by(recent.c.user_id, recent.c.created_at.desc(), recent.c.id.desc())
+  )
+
+def to_users_with_posts_count(rows) -> List[UserWithPostsCountRs]:
+  return [
+    UserWithPostsCountRs(**user.__dict__, posts_count=posts_count)
+    for user, _, posts_count in rows
+  ]
+
 class UserRepository:
   def __init__(self, db: Session):
     self.db = db
@@ -15,47 +104,125 @@ class UserRepository:
     """Obtiene un usuario por ID"""
     return self.db.query(User).filter(User.id == user_id).first()
 
+  def get_version(self, user_id: int) -> Optional[Tuple[datetime, Optional[datetime]]]:
+    """Obtiene solo (created_at, updated_at) de un usuario"""
+    return self.db.query(User.created_at, User.updated_at).filter(User.id == user_id).first()
+
   def get_by_email(self, email: EmailStr) -> Optional[User]:
     """Obtiene un usuario por email"""
     return self.db.query(User).filter(User.email == email).first()
 
+  def get_existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+    """Devuelve cuáles de los IDs existen, en una sola consulta"""
+    rows = self.db.query(User.id).filter(User.id.in_(set(user_ids))).all()
+    return {row.id for row in rows}
+
+  def get_existing_emails(self, emails: Iterable[str]) -> Set[str]:
+    """Devuelve cuáles de los emails ya están registrados, en una sola consulta"""
+    rows = self.db.query(User.email).filter(User.email.in_(set(emails))).all()
+    return {row.email for row in rows}
+
+  def copy_import_batch(self, rows: List[tuple]) -> int:
+    """
+    Carga un lote con COPY en una tabla temporal y lo fusiona con `users`.
+    - La tabla de staging es temporal y se vacía en cada commit.
+    - El merge usa ON CONFLICT (email) DO NOTHING ante importaciones concurrentes.
+    Devuelve la cantidad de usuarios insertados. Requiere el driver psycopg2.
+    """
+    columns = ", ".join(IMPORT_COLUMNS)
+    self.db.execute(text(
+      "CREATE TEMP TABLE IF NOT EXISTS users_import_staging "
+      "(email varchar(255), password varchar(255), first_name varchar(100), last_name varchar(100), "
+      "role varchar(20), is_active boolean, birth_date date) ON COMMIT DELETE ROWS"
+    ))
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor = self.db.connection().connection.cursor()
+    try:
+      cursor.copy_expert(f"COPY users_import_staging ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+      cursor.close()
+
+    result = self.db.execute(text(
+      f"INSERT INTO users ({columns}) SELECT {columns} FROM users_import_staging "
+      "ON CONFLICT (email) DO NOTHING"
+    ))
+    self.db.commit()
+    count_cache.invalidate("users")
+    return result.rowcount
+
   def get_all(self, page: int = 1, limit: int = 10) -> List[User]:
     """Obtiene todos los usuarios con paginación"""
     skip = (page - 1) * limit
     return self.db.query(User).offset(skip).limit(limit).all()
 
-  def create(self, user: User) -> User:
-    """Crea un nuevo usuario"""
-    self.db.add(user)
+  def create(self, values: dict) -> User:
+    """
+    Crea un nuevo usuario con un único INSERT ... RETURNING (sin refresh posterior).
+    El usuario se desvincula antes del commit para que no expire.
+    """
+    user = self.db.scalars(insert(User).values(**values).returning(User)).one()
+    self.db.expunge(user)
     self.db.commit()
-    self.db.refresh(user) 
+    count_cache.invalidate("users")
     return user
 
-  def update(self, user: User) -> User:
-    """Actualiza un usuario existente"""
+  def update(self, user_id: int, values: dict) -> Optional[User]:
+    """
+    Actualiza un usuario con un único UPDATE ... WHERE id = :id RETURNING (sin SELECT previo ni refresh).
+    Devuelve None si el usuario no existe. Sin campos a modificar solo se lee la fila actual.
+    """
+    if not values:
+      return self.get_by_id(user_id)
+    user = self.db.scalars(update(User).where(User.id == user_id).values(**values).returning(User)).one_or_none()
+    if user is None:
+      self.db.rollback()
+      return None
+    self.db.expunge(user)
     self.db.commit()
-    self.db.refresh(user)
+    # Cambios de nombre/email alteran los totales de búsqueda
+    count_cache.invalidate("users")
     return user
 
-  def delete(self, user: User) -> None:
-    """Elimina un usuario"""
-    self.db.delete(user)
+  def count_posts(self, user_id: int, limit: int) -> int:
+    """Cuenta los posts de un usuario hasta `limit` (se detiene ahí, usa ix_posts_user_id_created_at_id)"""
+    posts = select(Post.id).where(Post.user_id == user_id).limit(limit).subquery()
+    return self.db.execute(select(func.count()).select_from(posts)).scalar_one()
+
+  def delete_posts_chunk(self, user_id: int, chunk_size: int) -> int:
+    """Elimina hasta `chunk_size` posts del usuario en su propia transacción; devuelve cuántos borró"""
+    chunk = select(Post.id).where(Post.user_id == user_id).limit(chunk_size).scalar_subquery()
+    result = self.db.execute(
+      delete(Post).where(Post.id.in_(chunk)).execution_options(synchronize_session=False)
+    )
+    self.db.commit()
+    count_cache.invalidate("posts")
+    return result.rowcount
+
+  def delete(self, user_id: int) -> bool:
+    """Elimina un usuario con un único DELETE ... RETURNING id. Devuelve False si no existía."""
+    deleted = self.db.execute(delete(User).where(User.id == user_id).returning(User.id)).first()
+    if deleted is None:
+      self.db.rollback()
+      return False
     self.db.commit()
+    count_cache.invalidate("users")
+    count_cache.invalidate("posts")  # Sus posts se eliminan en cascada (ON DELETE CASCADE)
+    return True
     
-  def get_paginated(self, page: int = 1, limit: int = 10, search: str = "") -> List[User]:
+  def get_paginated(
+    self, page: int = 1, limit: int = 10, search: str = "", by_relevance: bool = False
+  ) -> List[User]:
     """Obtiene usuarios paginados con búsqueda opcional"""
     skip = (page - 1) * limit
     query = self.db.query(User)
     
     if search:
-      search_filter = f"%{search}%"
-      query = query.filter(
-        (User.first_name.ilike(search_filter)) |
-        (User.last_name.ilike(search_filter)) |
-        (User.email.ilike(search_filter))
-      )
+      query = query.filter(build_search_filter(search))
     
-    return query.order_by(User.id.desc()).offset(skip).limit(limit).all()
+    return query.order_by(*build_search_order(search, by_relevance)).offset(skip).limit(limit).all()
    
   def get_active_users(self, page: int = 1, limit: int = 10) -> List[User]:
     """Obtiene todos los usuarios activos con paginación"""
@@ -69,7 +236,7 @@ class UserRepository:
     )
 
   def get_users_with_post_count(
-    self, page: int = 1, limit: int = 10, search: str = ""
+    self, page: int = 1, limit: int = 10, search: str = "", by_relevance: bool = False
   ) -> List[UserWithPostsCountRs]:
     """Obtiene usuarios con conteo de posts, paginados y con búsqueda opcional"""
     skip = (page - 1) * limit
@@ -80,15 +247,10 @@ class UserRepository:
     )
 
     if search:
-      search_filter = f"%{search}%"
-      query = query.filter(
-        (User.first_name.ilike(search_filter)) |
-        (User.last_name.ilike(search_filter)) |
-        (User.email.ilike(search_filter))
-      )
+      query = query.filter(build_search_filter(search))
 
     results = (
-      query.order_by(User.id.desc())
+      query.order_by(*build_search_order(search, by_relevance))
       .offset(skip)
       .limit(limit)
       .all()
@@ -101,15 +263,168 @@ class UserRepository:
       )
       for user, posts_count in results
     ]
-  
+
+  def get_users_with_post_count_and_total(
+    self, page: int = 1, limit: int = 10, search: str = "", by_relevance: bool = False
+  ) -> Tuple[List[UserWithPostsCountRs], int]:
+    """
+    Obtiene la página de usuarios con conteo de posts y el total en un solo round trip.
+    El total sale del mismo snapshot que la página, por lo que ambos siempre coinciden.
+    """
+    rows = self.db.execute(build_page_with_total_stmt(page, limit, search, by_relevance)).all()
+    if rows:
+      total = rows[0].total_items
+      count_cache.set("users", search.lower(), total)
+    else:
+      # Página vacía: el total no viaja en ninguna fila
+      total = self.count_all(search) if page > 1 else 0
+    return to_users_with_posts_count(rows), total
+
+  def get_recent_posts(self, user_ids: Iterable[int], limit: int) -> List[Row]:
+    """Últimos posts (sin `content`) de varios usuarios en una consulta"""
+    user_ids = list(user_ids)
+    if not user_ids:
+      return []
+    return self.db.execute(build_recent_posts_stmt(user_ids, limit)).all()
+
   def count_all(self, search: str = "") -> int:
-    """Cuenta el total de usuarios con filtro opcional de búsqueda"""
+    """Cuenta el total de usuarios con filtro opcional de búsqueda (cacheado por filtro)"""
+    cache_key = search.lower()
+    total = count_cache.get("users", cache_key)
+    if total is not None:
+      return total
     query = self.db.query(User)
     if search:
-      search_filter = f"%{search}%"
-      query = query.filter(
-        (User.first_name.ilike(search_filter)) |
-        (User.last_name.ilike(search_filter)) |
-        (User.email.ilike(search_filter))
+      query = query.filter(build_search_filter(search))
+    total = query.count()
+    count_cache.set("users", cache_key, total)
+    return total
+
+  def estimate_all(self) -> Optional[int]:
+    """Total aproximado de usuarios según pg_class.reltuples (sin recorrer la tabla)"""
+    return estimate_rows(self.db, User.__tablename__)
+
+
+class AsyncUserRepository:
+  """Versión asíncrona de UserRepository (AsyncSession + asyncpg)"""
+
+  def __init__(self, db: AsyncSession):
+    self.db = db
+
+  async def get_by_id(self, user_id: int) -> Optional[User]:
+    """Obtiene un usuario por ID"""
+    result = await self.db.execute(select(User).where(User.id == user_id))
+    return result.scalar_one_or_none()
+
+  async def get_version(self, user_id: int) -> Optional[Tuple[datetime, Optional[datetime]]]:
+    """Obtiene solo (created_at, updated_at) de un usuario"""
+    result = await self.db.execute(select(User.created_at, User.updated_at).where(User.id == user_id))
+    return result.first()
+
+  async def get_by_email(self, email: EmailStr) -> Optional[User]:
+    """Obtiene un usuario por email"""
+    result = await self.db.execute(select(User).where(User.email == email))
+    return result.scalar_one_or_none()
+
+  async def get_existing_ids(self, user_ids: Iterable[int]) -> Set[int]:
+    """Devuelve cuáles de los IDs existen, en una sola consulta"""
+    result = await self.db.execute(select(User.id).where(User.id.in_(set(user_ids))))
+    return set(result.scalars().all())
+
+  async def create(self, values: dict) -> User:
+    """Crea un nuevo usuario con un único INSERT ... RETURNING"""
+    user = (await self.db.scalars(insert(User).values(**values).returning(User))).one()
+    await self.db.commit()
+    count_cache.invalidate("users")
+    return user
+
+  async def update(self, user_id: int, values: dict) -> Optional[User]:
+    """Actualiza un usuario con un único UPDATE ... RETURNING. Devuelve None si no existe."""
+    if not values:
+      return await self.get_by_id(user_id)
+    result = await self.db.scalars(update(User).where(User.id == user_id).values(**values).returning(User))
+    user = result.one_or_none()
+    if user is None:
+      await self.db.rollback()
+      return None
+    await self.db.commit()
+    count_cache.invalidate("users")
+    return user
+
+  async def count_posts(self, user_id: int, limit: int) -> int:
+    """Cuenta los posts de un usuario hasta `limit`"""
+    posts = select(Post.id).where(Post.user_id == user_id).limit(limit).subquery()
+    return (await self.db.execute(select(func.count()).select_from(posts))).scalar_one()
+
+  async def delete(self, user_id: int) -> bool:
+    """Elimina un usuario con un único DELETE ... RETURNING id. Devuelve False si no existía."""
+    deleted = (await self.db.execute(delete(User).where(User.id == user_id).returning(User.id))).first()
+    if deleted is None:
+      await self.db.rollback()
+      return False
+    await self.db.commit()
+    count_cache.invalidate("users")
+    count_cache.invalidate("posts")
+    return True
+
+  async def get_users_with_post_count(
+    self, page: int = 1, limit: int = 10, search: str = "", by_relevance: bool = False
+  ) -> List[UserWithPostsCountRs]:
+    """Obtiene usuarios con conteo de posts, paginados y con búsqueda opcional"""
+    skip = (page - 1) * limit
+    stmt = (
+      select(User, func.count(Post.id).label("posts_count"))
+      .outerjoin(Post, Post.user_id == User.id)
+      .group_by(User.id)
+    )
+
+    if search:
+      stmt = stmt.where(build_search_filter(search))
+
+    result = await self.db.execute(
+      stmt.order_by(*build_search_order(search, by_relevance)).offset(skip).limit(limit)
+    )
+
+    return [
+      UserWithPostsCountRs(
+        **user.__dict__,
+        posts_count=posts_count
       )
-    return query.count()
\ No newline at end of file
+      for user, posts_count in result.all()
+    ]
+
+  async def get_users_with_post_count_and_total(
+    self, page: int = 1, limit: int = 10, search: str = "", by_relevance: bool = False
+  ) -> Tuple[List[UserWithPostsCountRs], int]:
+    """Página de usuarios con conteo de posts y total en un solo round trip"""
+    rows = (await self.db.execute(build_page_with_total_stmt(page, limit, search, by_relevance))).all()
+    if rows:
+      total = rows[0].total_items
+      count_cache.set("users", search.lower(), total)
+    else:
+      total = await self.count_all(search) if page > 1 else 0
+    return to_users_with_posts_count(rows), total
+
+  async def get_recent_posts(self, user_ids: Iterable[int], limit: int) -> List[Row]:
+    """Últimos posts (sin `content`) de varios usuarios en una consulta"""
+    user_ids = list(user_ids)
+    if not user_ids:
+      return []
+    return (await self.db.execute(build_recent_posts_stmt(user_ids, limit))).all()
+
+  async def count_all(self, search: str = "") -> int:
+    """Cuenta el total de usuarios con filtro opcional de búsqueda (cacheado por filtro)"""
+    cache_key = search.lower()
+    total = count_cache.get("users", cache_key)
+    if total is not None:
+      return total
+    stmt = select(func.count()).select_from(User)
+    if search:
+      stmt = stmt.where(build_search_filter(search))
+    total = (await self.db.execute(stmt)).scalar_one()
+    count_cache.set("users", cache_key, total)
+    return total
+
+  async def estimate_all(self) -> Optional[int]:
+    """Total aproximado de usuarios según pg_class.reltuples (sin recorrer la tabla)"""
+    return await estimate_rows_async(self.db, User.__tablename__)
@@ -1,7 +1,8 @@
 from enum import Enum
-from pydantic import BaseModel, EmailStr, ConfigDict, Field
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, field_validator
 from typing import Optional
 from datetime import date, datetime
+from app.api.v1.post.post_schema import PostSummaryRs
 
 class UserRole(str, Enum):
   admin = "admin"
@@ -27,6 +28,24 @@ class UserUpdateRq(BaseModel):
   is_active: bool
   birth_date: Optional[date] = None  # único opcional
 
+# Actualización parcial (PATCH): solo se modifican los campos enviados
+class UserPatchRq(BaseModel):
+  email: Optional[EmailStr] = None
+  password: Optional[str] = Field(None, min_length=6)
+  first_name: Optional[str] = Field(None, min_length=3)
+  last_name: Optional[str] = Field(None, min_length=5)
+  role: Optional[UserRole] = None
+  is_active: Optional[bool] = None
+  birth_date: Optional[date] = None  # null la borra
+
+  @field_validator("email", "password", "first_name", "last_name", "role", "is_active")
+  @classmethod
+  def not_null(cls, value):
+    # Omitir el campo lo deja sin cambios; null explícito no es válido en columnas NOT NULL
+    if value is None:
+      raise ValueError("no puede ser null")
+    return value
+
 
 # Respuesta
 class UserRs(BaseModel):
@@ -40,6 +59,7 @@ class UserRs(BaseModel):
   birth_date: Optional[date] = None
   created_at: datetime
   updated_at: Optional[datetime]
+  recent_posts: Optional[list[PostSummaryRs]] = None  # Solo con ?include=recent_posts
 
 class UserWithPostsCountRs(UserRs):
   posts_count: int = 0
@@ -50,9 +70,26 @@ class UserItemRs(BaseModel):
   email: EmailStr
   created_at: str
   posts_count: Optional[int] = 0  # Contador de posts, si se carga la relación
+  recent_posts: Optional[list[PostSummaryRs]] = None  # Solo con ?include=recent_posts
 
 class UsersRs(BaseModel):
   users: list[UserItemRs]
   current_page: int
   total_pages: int
-  total_items: int
\ No newline at end of file
+  total_items: int
+  total_is_exact: bool = True  # False si total_items es una estimación
+
+# Importación masiva
+class UserImportErrorRs(BaseModel):
+  line: int
+  message: str
+
+class UserImportRs(BaseModel):
+  processed: int = 0
+  inserted: int = 0
+  skipped_existing: int = 0  # Email ya registrado en la tabla
+  duplicated_in_file: int = 0
+  invalid: int = 0
+  errors: list[UserImportErrorRs] = []  # Solo los primeros errores
+  elapsed_seconds: float = 0.0
+  rows_per_second: float = 0.0
@@ -1,13 +1,63 @@
+from collections import defaultdict
+from datetime import datetime
 from math import ceil
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple, Union
 from sqlalchemy.orm import Session
-from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.entity_cache import post_cache, user_cache
+from app.core.password_hasher import password_hasher
+from app.core.security import invalidate_principal
 from app.core.error_type import DuplicateResourceError, ResourceNotFoundError
 from app.api.v1.user.user_entity import User
-from app.api.v1.user.user_repository import UserRepository
-from app.api.v1.user.user_schema import UserCreateRq, UserUpdateRq, UserRs, UserItemRs, UsersRs
+from app.api.v1.user.user_repository import UserRepository, AsyncUserRepository
+from app.api.v1.user.user_purge import user_purger
+from app.api.v1.user.user_schema import UserCreateRq, UserUpdateRq, UserPatchRq, UserRs, UserItemRs, UsersRs
+from app.api.v1.post.post_schema import PostSummaryRs
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+settings = get_settings()
+
+# Relaciones que se pueden expandir con ?include=
+USER_INCLUDES = ("recent_posts",)
+
+def group_recent_posts(rows) -> Dict[int, List[PostSummaryRs]]:
+  """Agrupa por usuario las filas de la consulta LATERAL (ya vienen ordenadas)"""
+  grouped: Dict[int, List[PostSummaryRs]] = defaultdict(list)
+  for row in rows:
+    grouped[row.user_id].append(PostSummaryRs.model_validate(row))
+  return grouped
+
+def changed_fields(user: User, update_data: dict) -> dict:
+  """Campos enviados cuyo valor difiere del actual (la contraseña se compara aparte: se guarda su hash)"""
+  return {
+    field: value for field, value in update_data.items()
+    if field != "password" and getattr(user, field) != value
+  }
+
+def build_users_rs(
+  users: List, total_items: int, page: int, limit: int, total_is_exact: bool = True,
+  recent_posts: Optional[Dict[int, List[PostSummaryRs]]] = None
+) -> UsersRs:
+  """Mapea usuarios con conteo de posts (y sus últimos posts, si se pidieron) a la respuesta paginada"""
+  user_items = [
+    UserItemRs(
+      id=user.id,
+      name=f"{user.first_name} {user.last_name}",
+      email=user.email,
+      created_at=user.created_at.isoformat(),
+      posts_count=user.posts_count or 0,
+      recent_posts=recent_posts.get(user.id, []) if recent_posts is not None else None
+    )
+    for user in users
+  ]
+
+  return UsersRs(
+    users=user_items,
+    current_page=page,
+    total_pages=ceil(total_items / limit),
+    total_items=total_items,
+    total_is_exact=total_is_exact
+  )
 
 class UserService:
   def __init__(self, db: Session):
@@ -20,10 +70,10 @@ class UserService:
       raise DuplicateResourceError("El email ya está registrado")
 
     # Hash de la contraseña
-    hashed_password = pwd_context.hash(user_create.password)
+    hashed_password = password_hasher.hash(user_create.password)
 
-    # Crear instancia de User (SQLAlchemy)
-    new_user = User(
+    # Valores del nuevo usuario (un único INSERT ... RETURNING)
+    new_user = dict(
       email=user_create.email,
       password=hashed_password,
       first_name=user_create.first_name,
@@ -34,67 +84,272 @@ class UserService:
     )
 
     created_user = self.repo.create(new_user)
-    return UserRs.model_validate(created_user)
+    user_rs = UserRs.model_validate(created_user)
+    user_cache.set(user_rs.id, user_rs)
+    return user_rs
 
-  def get_users_paginated(self, page: int = 1, limit: int = 10, search: str = "") -> UsersRs:
+  def get_users_paginated(
+    self, page: int = 1, limit: int = 10, search: str = "", sort: str = "recent",
+    with_recent_posts: bool = False
+  ) -> UsersRs:
     """
     Obtiene usuarios paginados con búsqueda.
     - Formato: page + limit
     - page: número de página (1-based).
     - limit: número máximo de registros por página.
+    - sort: "recent" (más nuevos primero) o "relevance" (similitud con la búsqueda).
+    - with_recent_posts: incluye los últimos posts de cada usuario (una consulta para toda la página).
     Para paginadores clásicos en frontend.
     """
   
-    # Obtener usuarios y total en paralelo (conceptualmente)
-    users = self.repo.get_users_with_post_count(page=page, limit=limit, search=search)
-    total_items = self.repo.count_all(search=search)
-    
-    # Mapear usuarios a la respuesta
-    user_items = [
-      UserItemRs(
-        id=user.id,
-        name=f"{user.first_name} {user.last_name}",
-        email=user.email,
-        created_at=user.created_at.isoformat(),
-        posts_count=user.posts_count or 0
+    by_relevance = sort == "relevance"
+    if settings.count_mode == "estimated" and not search:
+      # La estimación evita recorrer la tabla para el total
+      users = self.repo.get_users_with_post_count(page=page, limit=limit, by_relevance=by_relevance)
+      total_items, total_is_exact = self.count_users(search)
+    else:
+      # Página y total en una sola consulta (count(*) OVER ())
+      users, total_items = self.repo.get_users_with_post_count_and_total(
+        page=page, limit=limit, search=search, by_relevance=by_relevance
       )
-      for user in users
-    ]
-    
-    total_pages = ceil(total_items / limit)
-    
-    return UsersRs(
-      users=user_items,
-      current_page=page,
-      total_pages=total_pages,
-      total_items=total_items
-    )
+      total_is_exact = True
+
+    recent_posts = None
+    if with_recent_posts:
+      rows = self.repo.get_recent_posts((user.id for user in users), settings.include_recent_posts_limit)
+      recent_posts = group_recent_posts(rows)
+    return build_users_rs(users, total_items, page, limit, total_is_exact, recent_posts)
+
+  def count_users(self, search: str = "") -> tuple[int, bool]:
+    """
+    Devuelve (total, es_exacto). La estimación de pg_class solo aplica sin búsqueda,
+    con filtro se usa el conteo exacto cacheado.
+    """
+    if settings.count_mode == "estimated" and not search:
+      estimate = self.repo.estimate_all()
+      if estimate is not None:
+        return estimate, False
+    return self.repo.count_all(search=search), True
   
-  def get_user(self, user_id: int) -> UserRs:
+  def get_user(self, user_id: int, with_recent_posts: bool = False) -> UserRs:
+    user_rs = user_cache.get(user_id)
+    if user_rs is None:
+      user = self.repo.get_by_id(user_id)
+      if not user:
+        raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+      user_rs = UserRs.model_validate(user)
+      user_cache.set(user_id, user_rs)
+    if with_recent_posts:
+      # Copia: la instancia de la caché no lleva los posts (cambian sin que cambie el usuario)
+      rows = self.repo.get_recent_posts([user_id], settings.include_recent_posts_limit)
+      return user_rs.model_copy(update={"recent_posts": group_recent_posts(rows).get(user_id, [])})
+    return user_rs
+
+  def get_user_version(self, user_id: int) -> Optional[Tuple[datetime, Optional[datetime]]]:
+    """Devuelve (created_at, updated_at) para validar un ETag (caché o consulta mínima)"""
+    cached = user_cache.get(user_id)
+    if cached is not None:
+      return cached.created_at, cached.updated_at
+    return self.repo.get_version(user_id)
+
+  def update_user(self, user_id: int, user_update: Union[UserUpdateRq, UserPatchRq]) -> UserRs:
+    """
+    Actualiza un usuario (PUT completo o PATCH parcial).
+    - Solo se escriben las columnas cuyo valor cambia; sin cambios no hay UPDATE.
+    - La contraseña se hashea solo si difiere de la actual (bcrypt es deliberadamente lento).
+    - Un email nuevo se valida como en la creación: si ya está registrado, 409.
+    """
     user = self.repo.get_by_id(user_id)
     if not user:
       raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
-    return UserRs.model_validate(user)
 
-  def update_user(self, user_id: int, user_update: UserUpdateRq) -> UserRs:
-    user = self.repo.get_by_id(user_id)
+    update_data = user_update.model_dump(exclude_unset=True)
+    changes = changed_fields(user, update_data)
+    if "email" in changes and self.repo.get_by_email(changes["email"]):
+      raise DuplicateResourceError("El email ya está registrado")
+    if "password" in update_data:
+      same, new_hash = password_hasher.verify_and_update(update_data["password"], user.password)
+      if not same:
+        changes["password"] = password_hasher.hash(update_data["password"])
+      elif new_hash:
+        changes["password"] = new_hash  # Misma contraseña con otro costo de bcrypt
+
+    updated_user = self.repo.update(user_id, changes) if changes else user
+    if not updated_user:
+      raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+    user_rs = UserRs.model_validate(updated_user)
+    user_cache.set(user_id, user_rs)
+    invalidate_principal(user_id)  # Email, rol o is_active pueden haber cambiado
+    return user_rs
+
+  def delete_user(self, user_id: int) -> bool:
+    """
+    Elimina un usuario con un único DELETE: sus posts los borra el ON DELETE CASCADE de la BD,
+    sin cargarlos en memoria.
+    Si tiene más posts que USER_PURGE_ASYNC_THRESHOLD solo se desactiva y devuelve False:
+    el controlador programa la purga por lotes en segundo plano (user_purger).
+    """
+    if user_purger.async_threshold:
+      posts_count = self.repo.count_posts(user_id, user_purger.async_threshold + 1)
+      if user_purger.should_defer(posts_count):
+        if not self.repo.update(user_id, {"is_active": False}):
+          raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+        user_cache.invalidate(user_id)
+        invalidate_principal(user_id)
+        return False
+    if not self.repo.delete(user_id):
+      raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+    user_cache.invalidate(user_id)
+    invalidate_principal(user_id)
+    # Sus posts se eliminaron en cascada y la caché de posts no está indexada por autor
+    post_cache.clear()
+    return True
+
+  def verify_credentials(self, email: str, password: str) -> Optional[User]:
+    """
+    Verifica email y contraseña. Devuelve el usuario o None si no coinciden.
+    Si el hash fue generado con otro costo de bcrypt, se actualiza de forma transparente.
+    Si el email no existe también se ejecuta bcrypt, para no revelarlo por el tiempo de respuesta.
+    """
+    user = self.repo.get_by_email(email)
+    if not user:
+      password_hasher.verify_dummy(password)
+      return None
+    valid, new_hash = password_hasher.verify_and_update(password, user.password)
+    if not valid:
+      return None
+    if new_hash:
+      user = self.repo.update(user.id, {"password": new_hash}) or user
+    return user
+
+
+class AsyncUserService:
+  """Versión asíncrona de UserService (AsyncSession + asyncpg)"""
+
+  def __init__(self, db: AsyncSession):
+    self.repo = AsyncUserRepository(db)
+
+  async def create_user(self, user_create: UserCreateRq) -> UserRs:
+    existing_user = await self.repo.get_by_email(user_create.email)
+    if existing_user:
+      raise DuplicateResourceError("El email ya está registrado")
+
+    hashed_password = await password_hasher.hash_async(user_create.password)
+
+    new_user = dict(
+      email=user_create.email,
+      password=hashed_password,
+      first_name=user_create.first_name,
+      last_name=user_create.last_name,
+      role=user_create.role.value if hasattr(user_create.role, "value") else user_create.role,
+      is_active=user_create.is_active,
+      birth_date=user_create.birth_date
+    )
+
+    created_user = await self.repo.create(new_user)
+    user_rs = UserRs.model_validate(created_user)
+    user_cache.set(user_rs.id, user_rs)
+    return user_rs
+
+  async def get_users_paginated(
+    self, page: int = 1, limit: int = 10, search: str = "", sort: str = "recent",
+    with_recent_posts: bool = False
+  ) -> UsersRs:
+    """Obtiene usuarios paginados con búsqueda (page + limit) y sus últimos posts opcionales"""
+    by_relevance = sort == "relevance"
+    if settings.count_mode == "estimated" and not search:
+      users = await self.repo.get_users_with_post_count(page=page, limit=limit, by_relevance=by_relevance)
+      total_items, total_is_exact = await self.count_users(search)
+    else:
+      users, total_items = await self.repo.get_users_with_post_count_and_total(
+        page=page, limit=limit, search=search, by_relevance=by_relevance
+      )
+      total_is_exact = True
+    recent_posts = None
+    if with_recent_posts:
+      rows = await self.repo.get_recent_posts((user.id for user in users), settings.include_recent_posts_limit)
+      recent_posts = group_recent_posts(rows)
+    return build_users_rs(users, total_items, page, limit, total_is_exact, recent_posts)
+
+  async def count_users(self, search: str = "") -> tuple[int, bool]:
+    """Devuelve (total, es_exacto); la estimación solo aplica sin búsqueda"""
+    if settings.count_mode == "estimated" and not search:
+      estimate = await self.repo.estimate_all()
+      if estimate is not None:
+        return estimate, False
+    return await self.repo.count_all(search=search), True
+
+  async def get_user(self, user_id: int, with_recent_posts: bool = False) -> UserRs:
+    user_rs = user_cache.get(user_id)
+    if user_rs is None:
+      user = await self.repo.get_by_id(user_id)
+      if not user:
+        raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+      user_rs = UserRs.model_validate(user)
+      user_cache.set(user_id, user_rs)
+    if with_recent_posts:
+      rows = await self.repo.get_recent_posts([user_id], settings.include_recent_posts_limit)
+      return user_rs.model_copy(update={"recent_posts": group_recent_posts(rows).get(user_id, [])})
+    return user_rs
+
+  async def get_user_version(self, user_id: int) -> Optional[Tuple[datetime, Optional[datetime]]]:
+    """Devuelve (created_at, updated_at) para validar un ETag (caché o consulta mínima)"""
+    cached = user_cache.get(user_id)
+    if cached is not None:
+      return cached.created_at, cached.updated_at
+    return await self.repo.get_version(user_id)
+
+  async def update_user(self, user_id: int, user_update: Union[UserUpdateRq, UserPatchRq]) -> UserRs:
+    """Actualiza solo las columnas que cambian; re-hashea solo si la contraseña es distinta"""
+    user = await self.repo.get_by_id(user_id)
     if not user:
       raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
 
-    # Actualizar solo los campos enviados
     update_data = user_update.model_dump(exclude_unset=True)
-
+    changes = changed_fields(user, update_data)
+    if "email" in changes and await self.repo.get_by_email(changes["email"]):
+      raise DuplicateResourceError("El email ya está registrado")
     if "password" in update_data:
-      update_data["password"] = pwd_context.hash(update_data["password"])
+      same, new_hash = await password_hasher.verify_and_update_async(update_data["password"], user.password)
+      if not same:
+        changes["password"] = await password_hasher.hash_async(update_data["password"])
+      elif new_hash:
+        changes["password"] = new_hash
 
-    for field, value in update_data.items():
-      setattr(user, field, value)
+    updated_user = await self.repo.update(user_id, changes) if changes else user
+    if not updated_user:
+      raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+    user_rs = UserRs.model_validate(updated_user)
+    user_cache.set(user_id, user_rs)
+    invalidate_principal(user_id)
+    return user_rs
 
-    updated_user = self.repo.update(user)
-    return UserRs.model_validate(updated_user)
+  async def delete_user(self, user_id: int) -> bool:
+    """Elimina un usuario (cascada en la BD); con muchos posts lo desactiva y devuelve False"""
+    if user_purger.async_threshold:
+      posts_count = await self.repo.count_posts(user_id, user_purger.async_threshold + 1)
+      if user_purger.should_defer(posts_count):
+        if not await self.repo.update(user_id, {"is_active": False}):
+          raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+        user_cache.invalidate(user_id)
+        invalidate_principal(user_id)
+        return False
+    if not await self.repo.delete(user_id):
+      raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
+    user_cache.invalidate(user_id)
+    invalidate_principal(user_id)
+    post_cache.clear()
+    return True
 
-  def delete_user(self, user_id: int) -> None:
-    user = self.repo.get_by_id(user_id)
+  async def verify_credentials(self, email: str, password: str) -> Optional[User]:
+    """Verifica email y contraseña; re-hashea si cambió el costo de bcrypt"""
+    user = await self.repo.get_by_email(email)
     if not user:
-      raise ResourceNotFoundError(f"Usuario con ID {user_id} no existe")
-    self.repo.delete(user)
+      await password_hasher.verify_dummy_async(password)
+      return None
+    valid, new_hash = await password_hasher.verify_and_update_async(password, user.password)
+    if not valid:
+      return None
+    if new_hash:
+      user = await self.repo.update(user.id, {"password": new_hash}) or user
+    return user
@@ -0,0 +1,241 @@
+import asyncio
+import math
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import get_settings
+from app.core.metrics import ADMISSION_IN_FLIGHT, ADMISSION_QUEUED, ADMISSION_REJECTIONS_TOTAL, ADMISSION_WAIT
+
+settings = get_settings()
+
+READS = "reads"
+WRITES = "writes"
+HASHING = "hashing"
+
+# Rutas con bcrypt (segundos de CPU por petición): grupo propio para no acaparar el resto
+HASHING_ROUTES = {
+  ("POST", "/api/v1/users"),
+  ("POST", "/api/v1/users/import"),
+  ("POST", "/api/v1/auth/token"),
+}
+# Rutas con ID en la ruta: la actualización de un usuario verifica y/o hashea la contraseña
+HASHING_ROUTE_PATTERNS = [
+  ({"PUT", "PATCH"}, re.compile(r"/api/v1/users/\d+")),
+]
+# Rutas que siempre se atienden (monitoreo y documentación)
+EXEMPT_PATHS = {"/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+def route_group(method: str, path: str) -> Optional[str]:
+  """Grupo de admisión de la petición, o None si no pasa por el control"""
+  path = path.rstrip("/") or "/"
+  if path in EXEMPT_PATHS or method == "OPTIONS":
+    return None
+  if (method, path) in HASHING_ROUTES:
+    return HASHING
+  if any(method in methods and pattern.fullmatch(path) for methods, pattern in HASHING_ROUTE_PATTERNS):
+    return HASHING
+  return READS if method in ("GET", "HEAD") else WRITES
+
+
+class ConcurrencyLimiter:
+  """
+  Límite de peticiones concurrentes de un grupo, con cola de espera acotada (FIFO).
+  Rechaza sin esperar si la cola está llena y deja de esperar al vencer el plazo:
+  en un pico se responde rápido en lugar de acumular peticiones en el threadpool
+  y en el pool de conexiones hasta que los clientes abandonen.
+  """
+
+  def __init__(self, group: str, limit: int, max_queue: int, timeout_seconds: float):
+    self.group = group
+    self.limit = limit
+    self.max_queue = max_queue
+    self.timeout_seconds = timeout_seconds
+    self._semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+    self.in_flight = 0
+    self.waiting = 0
+
+  async def acquire(self) -> Optional[str]:
+    """Devuelve None si la petición fue admitida, o el motivo del rechazo"""
+    if self._semaphore is not None:
+      if self._semaphore.locked():
+        if self.waiting >= self.max_queue or self.timeout_seconds <= 0:
+          return "queue_full"
+        self.waiting += 1
+        ADMISSION_QUEUED.labels(self.group).inc()
+        started = time.perf_counter()
+        try:
+          # acquire se espera en la propia tarea (no en una tarea aparte como con wait_for):
+          # si vence el plazo o se cancela la petición, Semaphore.acquire no se queda con el lugar
+          async with asyncio.timeout(self.timeout_seconds):
+            await self._semaphore.acquire()
+        except TimeoutError:
+          return "timeout"
+        finally:
+          self.waiting -= 1
+          ADMISSION_QUEUED.labels(self.group).dec()
+          ADMISSION_WAIT.labels(self.group).observe(time.perf_counter() - started)
+      else:
+        await self._semaphore.acquire()  # Hay lugar: no espera
+    self.in_flight += 1
+    ADMISSION_IN_FLIGHT.labels(self.group).inc()
+    return None
+
+  def release(self) -> None:
+    self.in_flight -= 1
+    ADMISSION_IN_FLIGHT.labels(self.group).dec()
+    if self._semaphore is not None:
+      self._semaphore.release()
+
+  def stats(self) -> dict:
+    return {"limit": self.limit, "in_flight": self.in_flight, "waiting": self.waiting}
+
+
+class TokenBucketLimiter:
+  """
+  Límite de tasa por cliente (token bucket): `rate` peticiones por segundo con ráfagas de hasta `burst`.
+  En memoria y por proceso; se recuerdan hasta `max_clients` clientes (LRU).
+  Solo se usa desde el event loop, por lo que no necesita lock.
+  """
+
+  def __init__(self, rate: float, burst: int, max_clients: int):
+    self.rate = rate
+    self.burst = burst
+    self.max_clients = max_clients
+    self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+  def take(self, client: str) -> float:
+    """Consume un token; devuelve 0 si se admite o los segundos hasta que haya uno disponible"""
+    now = time.monotonic()
+    tokens, updated_at = self._buckets.pop(client, (self.burst, now))
+    tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+    wait = 0.0
+    if tokens >= 1:
+      tokens -= 1
+    else:
+      wait = (1 - tokens) / self.rate
+    self._buckets[client] = (tokens, now)
+    if len(self._buckets) > self.max_clients:
+      self._buckets.popitem(last=False)
+    return wait
+
+  def stats(self) -> dict:
+    return {"rate_per_second": self.rate, "burst": self.burst, "clients": len(self._buckets)}
+
+
+class AdmissionController:
+  """Limitadores por grupo de rutas y límite de tasa opcional (ver AdmissionControlMiddleware)"""
+
+  def __init__(
+    self, limits: Dict[str, int], max_queue: int, queue_timeout_seconds: float,
+    rate_limiter: Optional[TokenBucketLimiter] = None
+  ):
+    self.limiters = {
+      group: ConcurrencyLimiter(group, limit, max_queue, queue_timeout_seconds)
+      for group, limit in limits.items()
+    }
+    self.rate_limiter = rate_limiter
+    # Reintento sugerido a los rechazados por capacidad: al menos el plazo de la cola
+    self.retry_after_seconds = max(1, math.ceil(queue_timeout_seconds))
+    self.rejected: Dict[str, int] = {}
+
+  def record_rejection(self, group: str, reason: str) -> None:
+    self.rejected[reason] = self.rejected.get(reason, 0) + 1
+    ADMISSION_REJECTIONS_TOTAL.labels(group, reason).inc()
+
+  def stats(self) -> dict:
+    return {
+      "groups": {group: limiter.stats() for group, limiter in self.limiters.items()},
+      "rate_limit": self.rate_limiter.stats() if self.rate_limiter is not None else None,
+      "rejected": dict(self.rejected),
+    }
+
+
+def client_key(scope: Scope) -> str:
+  """IP del cliente (detrás de un proxy, uvicorn la toma de X-Forwarded-For con --proxy-headers)"""
+  client = scope.get("client")
+  return client[0] if client else "unknown"
+
+def rejection_response(status_code: int, message: str, retry_after: int) -> JSONResponse:
+  # Mismo formato que los errores de error_handler
+  return JSONResponse(
+    status_code=status_code,
+    content={"status": "error", "message": message},
+    headers={"Retry-After": str(retry_after)},
+  )
+
+
+class AdmissionControlMiddleware:
+  """
+  Middleware ASGI de control de admisión (load shedding) delante del threadpool y del pool de conexiones.
+  - Límite de tasa por cliente opcional: 429 + Retry-After.
+  - Concurrencia por grupo (reads, writes, hashing) con cola acotada: 503 + Retry-After
+    si la cola está llena o vence el plazo de espera.
+  El lugar se libera al terminar de enviar la respuesta: las BackgroundTasks no lo ocupan.
+  """
+
+  def __init__(self, app: ASGIApp, controller: AdmissionController):
+    self.app = app
+    self.controller = controller
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+    group = route_group(scope["method"], scope["path"])
+    if group is None:
+      await self.app(scope, receive, send)
+      return
+
+    rate_limiter = self.controller.rate_limiter
+    if rate_limiter is not None:
+      wait = rate_limiter.take(client_key(scope))
+      if wait:
+        self.controller.record_rejection(group, "rate_limited")
+        response = rejection_response(429, "Demasiadas peticiones", max(1, math.ceil(wait)))
+        await response(scope, receive, send)
+        return
+
+    limiter = self.controller.limiters[group]
+    reason = await limiter.acquire()
+    if reason is not None:
+      self.controller.record_rejection(group, reason)
+      response = rejection_response(
+        503, "Servicio saturado, reintente más tarde", self.controller.retry_after_seconds
+      )
+      await response(scope, receive, send)
+      return
+
+    released = False
+    def release() -> None:
+      nonlocal released
+      if not released:
+        released = True
+        limiter.release()
+
+    async def send_wrapper(message: Message) -> None:
+      await send(message)
+      if message["type"] == "http.response.body" and not message.get("more_body", False):
+        release()
+
+    try:
+      await self.app(scope, receive, send_wrapper)
+    finally:
+      release()
+
+
+# Instancia compartida (middleware y /health)
+admission_controller = AdmissionController(
+  limits={
+    READS: settings.admission_reads_limit,
+    WRITES: settings.admission_writes_limit,
+    HASHING: settings.admission_hashing_limit,
+  },
+  max_queue=settings.admission_max_queue,
+  queue_timeout_seconds=settings.admission_queue_timeout_seconds,
+  rate_limiter=TokenBucketLimiter(
+    settings.rate_limit_per_second, settings.rate_limit_burst, settings.rate_limit_max_clients
+  ) if settings.rate_limit_enabled else None,
+)
@@ -0,0 +1,73 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import get_settings
+
+class CountCache:
+  """
+  Caché en memoria de totales para listados paginados.
+  Las claves son (namespace, filtro), p. ej. ("users", "ana"); los repositorios
+  invalidan el namespace completo cuando cambian las filas.
+  """
+
+  def __init__(self, ttl_seconds: float, max_entries: int):
+    self.ttl_seconds = ttl_seconds
+    self.max_entries = max_entries
+    self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, int]]" = OrderedDict()
+    self._lock = threading.Lock()
+
+  def get(self, namespace: str, key: Hashable = "") -> Optional[int]:
+    if self.ttl_seconds <= 0:
+      return None
+    with self._lock:
+      entry = self._entries.get((namespace, key))
+      if entry is None:
+        return None
+      expires_at, value = entry
+      if expires_at < time.monotonic():
+        del self._entries[(namespace, key)]
+        return None
+      self._entries.move_to_end((namespace, key))
+      return value
+
+  def set(self, namespace: str, key: Hashable, value: int) -> None:
+    if self.ttl_seconds <= 0:
+      return
+    with self._lock:
+      self._entries[(namespace, key)] = (time.monotonic() + self.ttl_seconds, value)
+      self._entries.move_to_end((namespace, key))
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+
+  def invalidate(self, namespace: str) -> None:
+    """Elimina todos los conteos de un namespace (p. ej. tras insertar o eliminar)"""
+    with self._lock:
+      for cache_key in [k for k in self._entries if k[0] == namespace]:
+        del self._entries[cache_key]
+
+
+# Estimación del planner: no recorre la tabla, precisión según el último ANALYZE/autovacuum
+ESTIMATE_SQL = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+
+def estimate_rows(db: Session, table: str) -> Optional[int]:
+  """Cantidad aproximada de filas de una tabla; None si aún no hay estadísticas"""
+  estimate = db.execute(ESTIMATE_SQL, {"table": table}).scalar()
+  return estimate if estimate is not None and estimate >= 0 else None
+
+async def estimate_rows_async(db: AsyncSession, table: str) -> Optional[int]:
+  """Versión asíncrona de `estimate_rows`"""
+  estimate = (await db.execute(ESTIMATE_SQL, {"table": table})).scalar()
+  return estimate if estimate is not None and estimate >= 0 else None
+
+
+settings = get_settings()
+
+# Instancia compartida por los repositorios
+count_cache = CountCache(
+  ttl_seconds=settings.count_cache_ttl_seconds,
+  max_entries=settings.count_cache_max_entries,
+)
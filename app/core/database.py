@@ -1,13 +1,40 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
-from typing import Generator
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from typing import AsyncGenerator, Generator
 from app.core.config import get_settings
+from app.core.pool_monitor import MonitoredAsyncQueuePool, MonitoredQueuePool
+from app.core.startup import startup_report
 
 settings = get_settings()
 
-# Crear el motor de conexión
-engine = create_engine(settings.database_url)
+def get_pool_options() -> dict:
+  """Parámetros del pool de conexiones comunes a los motores sync y async"""
+  return {
+    "pool_size": settings.db_pool_size,
+    "max_overflow": settings.db_max_overflow,
+    "pool_timeout": settings.db_pool_timeout,
+    "pool_recycle": settings.db_pool_recycle,
+    "pool_pre_ping": settings.db_pool_pre_ping,
+  }
+
+# statement_timeout del servidor, aplicado a cada conexión nueva (0 = sin límite)
+connect_args = {}
+async_connect_args = {}
+if settings.db_statement_timeout_ms > 0:
+  connect_args["options"] = f"-c statement_timeout={settings.db_statement_timeout_ms}"
+  async_connect_args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+
+# Crear el motor de conexión (no abre conexiones hasta el primer uso)
+with startup_report.phase("engine (incluido en imports)"):
+  engine = create_engine(
+    settings.database_url,
+    poolclass=MonitoredQueuePool,
+    connect_args=connect_args,
+    **get_pool_options()
+  )
+  MonitoredQueuePool.monitor.attach(engine)
 
 # Crear una clase Base para que tus modelos hereden de ella
 Base = declarative_base()
@@ -15,6 +42,36 @@ Base = declarative_base()
 # Crear una clase SessionLocal para instanciar sesiones con la BD
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
+def get_async_database_url(url: str) -> str:
+  """
+  Convierte la URL de conexión al driver asyncpg.
+  postgresql://... o postgresql+psycopg2://... -> postgresql+asyncpg://...
+  """
+  scheme, _, rest = url.partition("://")
+  return f"{scheme.split('+')[0]}+asyncpg://{rest}"
+
+# Motor y sesiones asíncronas (solo se crean en modo async, requieren asyncpg)
+async_engine = None
+AsyncSessionLocal = None
+if settings.db_mode == "async":
+  with startup_report.phase("async engine (incluido en imports)"):
+    async_engine = create_async_engine(
+      get_async_database_url(settings.database_url),
+      poolclass=MonitoredAsyncQueuePool,
+      connect_args=async_connect_args,
+      **get_pool_options()
+    )
+    MonitoredAsyncQueuePool.monitor.attach(async_engine.sync_engine)
+  # expire_on_commit=False evita cargas implícitas (no permitidas en async) tras el commit
+  AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+def get_pool_stats() -> dict:
+  """Estado de los pools de conexiones: en uso, libres, overflow y tiempos de espera"""
+  return {
+    "sync": MonitoredQueuePool.monitor.stats(engine.pool),
+    "async": MonitoredAsyncQueuePool.monitor.stats(async_engine.pool) if async_engine is not None else None,
+  }
+
 def get_db() -> Generator[Session, None, None]:
   """
   Dependencia para obtener una sesión de base de datos.
@@ -25,6 +82,14 @@ def get_db() -> Generator[Session, None, None]:
   finally:
     db.close()
 
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+  """
+  Dependencia para obtener una sesión asíncrona de base de datos.
+  Requiere DB_MODE=async.
+  """
+  async with AsyncSessionLocal() as db:
+    yield db
+
 def test_connection() -> bool:
   """
   Prueba la conexión a la base de datos y muestra el resultado por consola.
@@ -0,0 +1,83 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, Tuple, TypeVar
+from app.core.config import get_settings
+
+T = TypeVar("T")
+
+class EntityCache(Generic[T]):
+  """
+  Caché LRU con TTL de entidades ya serializadas (PostRs, UserRs) por ID.
+  Un acierto evita la consulta y la hidratación del ORM. Los valores se
+  comparten entre peticiones, por lo que deben tratarse como de solo lectura.
+  """
+
+  def __init__(self, name: str, enabled: bool, max_entries: int, ttl_seconds: float):
+    self.name = name
+    self.enabled = enabled and max_entries > 0 and ttl_seconds > 0
+    self.max_entries = max_entries
+    self.ttl_seconds = ttl_seconds
+    self._entries: "OrderedDict[Hashable, Tuple[float, T]]" = OrderedDict()
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def get(self, key: Hashable) -> Optional[T]:
+    if not self.enabled:
+      return None
+    with self._lock:
+      entry = self._entries.get(key)
+      if entry is None or entry[0] < time.monotonic():
+        if entry is not None:
+          del self._entries[key]
+        self.misses += 1
+        return None
+      self._entries.move_to_end(key)
+      self.hits += 1
+      return entry[1]
+
+  def set(self, key: Hashable, value: T) -> None:
+    if not self.enabled:
+      return
+    with self._lock:
+      self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+      self._entries.move_to_end(key)
+      while len(self._entries) > self.max_entries:
+        self._entries.popitem(last=False)
+        self.evictions += 1
+
+  def invalidate(self, key: Hashable) -> None:
+    with self._lock:
+      self._entries.pop(key, None)
+
+  def clear(self) -> None:
+    with self._lock:
+      self._entries.clear()
+
+  def stats(self) -> dict:
+    with self._lock:
+      size = len(self._entries)
+    lookups = self.hits + self.misses
+    return {
+      "enabled": self.enabled,
+      "size": size,
+      "max_entries": self.max_entries,
+      "ttl_seconds": self.ttl_seconds,
+      "hits": self.hits,
+      "misses": self.misses,
+      "evictions": self.evictions,
+      "hit_ratio": self.hits / lookups if lookups else 0.0,
+    }
+
+
+settings = get_settings()
+
+# Instancias compartidas por los servicios (claves: UUID del post en texto, ID del usuario)
+post_cache: "EntityCache" = EntityCache(
+  "posts", settings.post_cache_enabled, settings.post_cache_max_entries, settings.post_cache_ttl_seconds
+)
+user_cache: "EntityCache" = EntityCache(
+  "users", settings.user_cache_enabled, settings.user_cache_max_entries, settings.user_cache_ttl_seconds
+)
@@ -16,7 +16,8 @@ def setup_exception_handlers(app: FastAPI) -> None:
             content={
                 "status": "error",
                 "message": exc.detail,
-            }
+            },
+            headers=exc.headers,
         )
 
     @app.exception_handler(StarletteHTTPException)
@@ -27,6 +28,7 @@ def setup_exception_handlers(app: FastAPI) -> None:
                 "status": "error",
                 "message": exc.detail,
             },
+            headers=getattr(exc, "headers", None),
         )
 
     @app.exception_handler(RequestValidationError)
@@ -1,16 +1,18 @@
+from typing import Dict, Optional
 from fastapi import HTTPException, status
 
 class BaseError(HTTPException):
-  def __init__(self, status_code: int, detail: str):
-    super().__init__(status_code=status_code, detail=detail)
+  def __init__(self, status_code: int, detail: str, headers: Optional[Dict[str, str]] = None):
+    super().__init__(status_code=status_code, detail=detail, headers=headers)
 
 class BadRequestError(BaseError):
   def __init__(self, detail: str = "Solicitud incorrecta"):
     super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
 
 class UnauthorizedError(BaseError):
+  # Autenticación bearer (RFC 6750): todo 401 indica el esquema esperado
   def __init__(self, detail: str = "No autorizado"):
-    super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+    super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail, headers={"WWW-Authenticate": "Bearer"})
 
 class ForbiddenError(BaseError):
   def __init__(self, detail: str = "Acceso prohibido"):
@@ -23,3 +25,7 @@ class ResourceNotFoundError(BaseError):
 class DuplicateResourceError(BaseError):
   def __init__(self, detail: str = "Recurso duplicado"):
     super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+class ServiceUnavailableError(BaseError):
+  def __init__(self, detail: str = "Servicio no disponible"):
+    super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
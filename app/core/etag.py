@@ -0,0 +1,37 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional
+from fastapi import Request, Response, status
+
+def _digest(value: str) -> str:
+  return hashlib.blake2b(value.encode(), digest_size=12).hexdigest()
+
+def entity_etag(entity_id, created_at: datetime, updated_at: Optional[datetime], revision=None) -> str:
+  """
+  ETag fuerte de una entidad: cambia cada vez que cambia `updated_at`.
+  Solo depende del ID y las marcas de tiempo, por lo que se puede calcular sin cargar la fila completa.
+  - revision: valor que cambia sin modificar `updated_at` (p. ej. las vistas de un post).
+  """
+  version = updated_at.isoformat() if updated_at else ""
+  if revision is not None:
+    version = f"{version}|{revision}"
+  return f'"{_digest(f"{entity_id}|{created_at.isoformat()}|{version}")}"'
+
+def weak_etag(values: Iterable) -> str:
+  """ETag débil para listados, calculado a partir de los valores relevantes de cada elemento"""
+  return f'W/"{_digest("|".join(str(value) for value in values))}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+  """Comparación débil de If-None-Match (RFC 9110): ignora el prefijo W/ y acepta `*`"""
+  if not if_none_match:
+    return False
+  if if_none_match.strip() == "*":
+    return True
+  opaque = etag.removeprefix("W/")
+  return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+  """Devuelve una respuesta 304 si el cliente ya tiene la versión `etag`, si no None"""
+  if etag_matches(request.headers.get("if-none-match"), etag):
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+  return None
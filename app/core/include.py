@@ -0,0 +1,17 @@
+from typing import Iterable, Optional, Set
+from app.core.error_type import BadRequestError
+
+def parse_include(include: Optional[str], allowed: Iterable[str]) -> Set[str]:
+  """
+  Interpreta `?include=a,b` (relaciones a expandir en la respuesta).
+  Solo se aceptan las relaciones permitidas por el endpoint; el resto responde 400.
+  """
+  if not include:
+    return set()
+  requested = {name.strip() for name in include.split(",") if name.strip()}
+  unknown = requested - set(allowed)
+  if unknown:
+    raise BadRequestError(
+      f"include no soporta: {', '.join(sorted(unknown))}. Opciones: {', '.join(sorted(allowed))}"
+    )
+  return requested
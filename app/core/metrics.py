@@ -0,0 +1,130 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+from fastapi import Response
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from starlette.routing import NoMatchFound
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Rutas sin coincidencia (404) comparten etiqueta para no crear una serie por URL
+UNMATCHED_ROUTE = "unmatched"
+# Consultas ejecutadas fuera de una petición (tareas en segundo plano, arranque)
+BACKGROUND_ROUTE = "background"
+
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+REQUEST_DURATION = Histogram(
+  "http_request_duration_seconds", "Latencia de las peticiones HTTP", ["method", "route"]
+)
+REQUESTS_TOTAL = Counter(
+  "http_requests_total", "Peticiones HTTP por código de estado", ["method", "route", "status"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+  "http_requests_in_progress", "Peticiones HTTP en curso"
+)
+DB_QUERIES_TOTAL = Counter(
+  "db_queries_total", "Sentencias SQL ejecutadas por ruta", ["route"]
+)
+DB_QUERY_DURATION = Histogram(
+  "db_query_duration_seconds", "Duración de las sentencias SQL por ruta", ["route"], buckets=DB_BUCKETS
+)
+ADMISSION_REJECTIONS_TOTAL = Counter(
+  "http_requests_rejected_total", "Peticiones rechazadas por el control de admisión", ["group", "reason"]
+)
+ADMISSION_IN_FLIGHT = Gauge(
+  "admission_in_flight", "Peticiones admitidas en curso por grupo de rutas", ["group"]
+)
+ADMISSION_QUEUED = Gauge(
+  "admission_queued", "Peticiones esperando admisión por grupo de rutas", ["group"]
+)
+ADMISSION_WAIT = Histogram(
+  "admission_wait_seconds", "Espera en la cola de admisión por grupo de rutas", ["group"], buckets=DB_BUCKETS
+)
+
+# Scope ASGI de la petición en curso; el router le agrega la ruta al resolverla
+_current_scope: ContextVar[Optional[dict]] = ContextVar("metrics_current_scope", default=None)
+# Plantilla completa por ruta (id de la ruta -> plantilla); se calcula una vez por ruta
+_route_templates: Dict[int, str] = {}
+
+def route_template(scope: dict, route) -> str:
+  """
+  Plantilla completa de la ruta, con los prefijos de los routers incluidos.
+  La ruta del scope solo conoce su propio path (p. ej. /{post_id}), por lo que la plantilla
+  se reconstruye con url_path_for usando los parámetros como marcadores (los nombres de ruta son únicos).
+  """
+  template = _route_templates.get(id(route))
+  if template is None:
+    template = route.path_format
+    params = {name: f"{{{name}}}" for name in getattr(route, "param_convertors", {})}
+    try:
+      template = str(scope["app"].url_path_for(route.name, **params))
+    except (KeyError, NoMatchFound):
+      pass
+    _route_templates[id(route)] = template
+  return template
+
+def route_label(scope: Optional[dict]) -> str:
+  """Plantilla de la ruta (p. ej. /api/v1/posts/{post_id}), no la URL concreta"""
+  if scope is None:
+    return BACKGROUND_ROUTE
+  route = scope.get("route")
+  if getattr(route, "path_format", None) is None:
+    return UNMATCHED_ROUTE
+  return route_template(scope, route)
+
+
+class MetricsMiddleware:
+  """
+  Middleware ASGI que registra latencia, código de estado y peticiones en curso.
+  Se implementa como ASGI puro (sin BaseHTTPMiddleware) para no agregar una tarea por petición.
+  """
+
+  def __init__(self, app: ASGIApp):
+    self.app = app
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    status_code = 500
+    async def send_wrapper(message: Message) -> None:
+      nonlocal status_code
+      if message["type"] == "http.response.start":
+        status_code = message["status"]
+      await send(message)
+
+    token = _current_scope.set(scope)
+    REQUESTS_IN_PROGRESS.inc()
+    started = time.perf_counter()
+    try:
+      await self.app(scope, receive, send_wrapper)
+    finally:
+      elapsed = time.perf_counter() - started
+      REQUESTS_IN_PROGRESS.dec()
+      _current_scope.reset(token)
+      route = route_label(scope)
+      REQUEST_DURATION.labels(scope["method"], route).observe(elapsed)
+      REQUESTS_TOTAL.labels(scope["method"], route, str(status_code)).inc()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+  context._metrics_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+  started = getattr(context, "_metrics_started", None)
+  if started is None:
+    return
+  route = route_label(_current_scope.get())
+  DB_QUERIES_TOTAL.labels(route).inc()
+  DB_QUERY_DURATION.labels(route).observe(time.perf_counter() - started)
+
+def instrument_engine(engine) -> None:
+  """Registra los hooks de SQLAlchemy en un motor sync (o en `async_engine.sync_engine`)"""
+  event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+  event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def metrics_response() -> Response:
+  """Métricas en formato de exposición de texto de Prometheus"""
+  return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,62 @@
+from pathlib import Path
+from typing import Set
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+# Clave del advisory lock de Postgres que serializa las migraciones entre procesos
+MIGRATION_LOCK_ID = 4_242_017_001
+
+def get_alembic_config() -> Config:
+  return Config(str(ALEMBIC_INI))
+
+def get_script_heads(config: Config) -> Set[str]:
+  """Revisiones head según los scripts de alembic/versions"""
+  return set(ScriptDirectory.from_config(config).get_heads())
+
+def get_current_heads(connection: Connection) -> Set[str]:
+  """Revisiones registradas en la tabla alembic_version de la BD"""
+  heads = set(MigrationContext.configure(connection).get_current_heads())
+  connection.commit()
+  return heads
+
+def migrate_if_needed(engine: Engine) -> bool:
+  """
+  Aplica las migraciones pendientes dentro del proceso, sin lanzar `alembic` como subproceso.
+  - Si alembic_version ya coincide con el head de los scripts, no hace nada (una sola consulta).
+  - Si no, toma un advisory lock para que solo un proceso migre; los demás esperan y,
+    al obtener el lock, vuelven a comparar y encuentran la BD al día.
+  Devuelve True si se aplicaron migraciones.
+  """
+  config = get_alembic_config()
+  script_heads = get_script_heads(config)
+
+  with engine.connect() as connection:
+    if get_current_heads(connection) == script_heads:
+      return False
+
+    # Lock de sesión: se mantiene entre las transacciones que abre Alembic
+    connection.execute(text("SELECT pg_advisory_lock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+    connection.commit()
+    try:
+      if get_current_heads(connection) == script_heads:
+        return False
+      config.attributes["connection"] = connection
+      command.upgrade(config, "head")
+      return True
+    finally:
+      connection.execute(text("SELECT pg_advisory_unlock(:lock_id)"), {"lock_id": MIGRATION_LOCK_ID})
+      connection.commit()
+
+
+if __name__ == "__main__":
+  # Uso (paso previo al despliegue): python -m app.core.migrations
+  from app.core.database import engine
+
+  applied = migrate_if_needed(engine)
+  print("✅ Migraciones aplicadas correctamente" if applied else "✅ La base de datos ya está al día")
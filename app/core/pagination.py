@@ -0,0 +1,28 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+from app.core.error_type import BadRequestError
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+  """
+  Genera un cursor opaco a partir de la clave de ordenamiento (created_at, id).
+  El cliente solo debe reenviarlo, nunca interpretarlo.
+  """
+  payload = json.dumps({"c": created_at.isoformat(), "i": str(item_id)}, separators=(",", ":"))
+  return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, UUID]]:
+  """
+  Decodifica un cursor generado por `encode_cursor`.
+  Un cursor vacío representa la primera página y devuelve None.
+  """
+  if not cursor:
+    return None
+  try:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+  except (ValueError, KeyError, TypeError):
+    raise BadRequestError("Cursor de paginación inválido")
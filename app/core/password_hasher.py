@@ -0,0 +1,191 @@
+import asyncio
+import multiprocessing
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List, Optional, Tuple
+from passlib.context import CryptContext
+from app.core.config import get_settings
+from app.core.error_type import ServiceUnavailableError
+
+def build_crypt_context(rounds: int) -> CryptContext:
+  """
+  Contexto bcrypt con costo fijo.
+  min_rounds = max_rounds = rounds hace que `needs_update` marque los hashes
+  generados con otro costo, lo que permite re-hashearlos al verificar.
+  """
+  return CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=rounds,
+    bcrypt__min_rounds=rounds,
+    bcrypt__max_rounds=rounds,
+  )
+
+# Contexto propio de cada proceso del pool (se crea en el initializer)
+_worker_context: Optional[CryptContext] = None
+
+def _init_worker(rounds: int) -> None:
+  global _worker_context
+  _worker_context = build_crypt_context(rounds)
+
+def _hash(password: str) -> str:
+  return _worker_context.hash(password)
+
+def _verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+  return _worker_context.verify_and_update(password, hashed)
+
+
+class PasswordHasher:
+  """
+  Ejecuta bcrypt en un pool de procesos dedicado y acotado.
+  - Libera los hilos del servidor y el GIL mientras se calcula el hash.
+  - Rechaza con 503 cuando hay más de `max_pending` operaciones en cola.
+  - Con workers=0 se ejecuta en el hilo llamador (útil en desarrollo).
+  """
+
+  def __init__(self, rounds: int, workers: int, max_pending: int):
+    self.rounds = rounds
+    self.workers = workers
+    self.max_pending = max_pending
+    self._executor: Optional[ProcessPoolExecutor] = None
+    self._lock = threading.Lock()
+    self._pending = 0
+    self._dummy_hash: Optional[str] = None
+    self._stats = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0,
+                   "total_seconds": 0.0, "max_seconds": 0.0}
+    if workers <= 0:
+      _init_worker(rounds)
+
+  def _get_executor(self) -> ProcessPoolExecutor:
+    if self._executor is None:
+      with self._lock:
+        if self._executor is None:
+          self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            # spawn evita heredar hilos y conexiones del proceso servidor
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.rounds,),
+          )
+    return self._executor
+
+  def _acquire(self) -> float:
+    with self._lock:
+      if self._pending >= self.max_pending:
+        self._stats["rejected"] += 1
+        raise ServiceUnavailableError("Servicio de contraseñas saturado, intente nuevamente")
+      self._pending += 1
+      self._stats["submitted"] += 1
+    return time.perf_counter()
+
+  def _release(self, started: float, failed: bool) -> None:
+    elapsed = time.perf_counter() - started
+    with self._lock:
+      self._pending -= 1
+      self._stats["failed" if failed else "completed"] += 1
+      self._stats["total_seconds"] += elapsed
+      self._stats["max_seconds"] = max(self._stats["max_seconds"], elapsed)
+
+  def _submit(self, fn: Callable, *args) -> Future:
+    started = self._acquire()
+    if self.workers <= 0:
+      future: Future = Future()
+      try:
+        future.set_result(fn(*args))
+      except Exception as e:
+        future.set_exception(e)
+    else:
+      try:
+        future = self._get_executor().submit(fn, *args)
+      except Exception:
+        self._release(started, failed=True)
+        raise
+    future.add_done_callback(lambda f: self._release(started, f.cancelled() or f.exception() is not None))
+    return future
+
+  def hash(self, password: str) -> str:
+    """Genera el hash bloqueando el hilo llamador (rutas sync)"""
+    return self._submit(_hash, password).result()
+
+  async def hash_async(self, password: str) -> str:
+    """Genera el hash sin bloquear el event loop (rutas async)"""
+    return await asyncio.wrap_future(self._submit(_hash, password))
+
+  def hash_many(self, passwords: List[str]) -> List[str]:
+    """
+    Genera los hashes de un lote repartiéndolo entre todos los procesos del pool.
+    El lote ocupa un único lugar en la cola.
+    """
+    if not passwords:
+      return []
+    started = self._acquire()
+    failed = True
+    try:
+      if self.workers <= 0:
+        hashes = [_hash(password) for password in passwords]
+      else:
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        hashes = list(self._get_executor().map(_hash, passwords, chunksize=chunksize))
+      failed = False
+      return hashes
+    finally:
+      self._release(started, failed)
+
+  def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifica la contraseña. Si es válida pero el hash usa otro costo,
+    devuelve también el nuevo hash para persistirlo.
+    """
+    return self._submit(_verify_and_update, password, hashed).result()
+
+  async def verify_and_update_async(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """Versión asíncrona de `verify_and_update`"""
+    return await asyncio.wrap_future(self._submit(_verify_and_update, password, hashed))
+
+  def verify_dummy(self, password: str) -> None:
+    """
+    Verifica contra un hash fijo con el mismo costo y descarta el resultado.
+    Se usa cuando el email no existe: el login tarda lo mismo que con una contraseña incorrecta
+    y el tiempo de respuesta no revela qué emails están registrados.
+    """
+    if self._dummy_hash is None:
+      self._dummy_hash = self.hash(secrets.token_urlsafe(16))
+    self.verify_and_update(password, self._dummy_hash)
+
+  async def verify_dummy_async(self, password: str) -> None:
+    """Versión asíncrona de `verify_dummy`"""
+    if self._dummy_hash is None:
+      self._dummy_hash = await self.hash_async(secrets.token_urlsafe(16))
+    await self.verify_and_update_async(password, self._dummy_hash)
+
+  def stats(self) -> dict:
+    """Métricas del pool: operaciones, rechazos, cola actual y tiempos"""
+    with self._lock:
+      stats = dict(self._stats)
+      pending = self._pending
+    done = stats["completed"] + stats["failed"]
+    return {
+      **stats,
+      "pending": pending,
+      "max_pending": self.max_pending,
+      "workers": self.workers,
+      "rounds": self.rounds,
+      "avg_seconds": stats["total_seconds"] / done if done else 0.0,
+    }
+
+  def shutdown(self) -> None:
+    if self._executor is not None:
+      self._executor.shutdown(wait=True, cancel_futures=True)
+      self._executor = None
+
+
+settings = get_settings()
+
+# Instancia compartida por los servicios
+password_hasher = PasswordHasher(
+  rounds=settings.bcrypt_rounds,
+  workers=settings.password_hash_workers,
+  max_pending=settings.password_hash_max_pending,
+)
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import deque
+from math import ceil
+from typing import Iterable, Optional
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+def percentiles(values: Iterable[float], points: Iterable[int] = (50, 95, 99)) -> dict:
+  """Percentiles por el método del rango más cercano: {"p50": ..., "p95": ..., "p99": ...}"""
+  ordered = sorted(values)
+  if not ordered:
+    return {f"p{point}": None for point in points}
+  return {f"p{point}": ordered[max(ceil(point / 100 * len(ordered)) - 1, 0)] for point in points}
+
+
+class PoolMonitor:
+  """
+  Estadísticas de un pool de conexiones.
+  - Contadores de checkout/checkin/conexiones nuevas/invalidaciones mediante eventos del pool.
+  - Tiempo de espera por una conexión (muestra de las últimas `sample_size` esperas).
+  """
+
+  def __init__(self, sample_size: int = 1000):
+    self._waits: deque = deque(maxlen=sample_size)
+    self._lock = threading.Lock()
+    self.checkouts = 0
+    self.checkins = 0
+    self.connects = 0
+    self.invalidations = 0
+    self.timeouts = 0
+
+  def record_wait(self, seconds: float) -> None:
+    with self._lock:
+      self._waits.append(seconds)
+
+  def record_timeout(self) -> None:
+    with self._lock:
+      self.timeouts += 1
+
+  def _increment(self, counter: str) -> None:
+    with self._lock:
+      setattr(self, counter, getattr(self, counter) + 1)
+
+  def attach(self, engine) -> None:
+    """Registra los eventos en el pool del motor (se conservan si el pool se recrea)"""
+    event.listen(engine, "checkout", lambda *args: self._increment("checkouts"))
+    event.listen(engine, "checkin", lambda *args: self._increment("checkins"))
+    event.listen(engine, "connect", lambda *args: self._increment("connects"))
+    event.listen(engine, "invalidate", lambda *args: self._increment("invalidations"))
+
+  def stats(self, pool: Optional[Pool]) -> Optional[dict]:
+    if pool is None:
+      return None
+    with self._lock:
+      waits = list(self._waits)
+      counters = {
+        "checkouts": self.checkouts,
+        "checkins": self.checkins,
+        "connects": self.connects,
+        "invalidations": self.invalidations,
+        "timeouts": self.timeouts,
+      }
+    wait_ms = {
+      name: round(value * 1000, 3) if value is not None else None
+      for name, value in percentiles(waits).items()
+    }
+    wait_ms["max"] = round(max(waits) * 1000, 3) if waits else None
+    return {
+      "size": pool.size(),
+      "checked_out": pool.checkedout(),
+      "idle": pool.checkedin(),
+      "overflow": max(pool.overflow(), 0),
+      **counters,
+      "wait_ms": wait_ms,
+    }
+
+
+class _TimedPoolMixin:
+  """
+  Mide cuánto espera cada checkout por una conexión (incluye abrir una nueva).
+  Los eventos del pool se emiten después de obtener la conexión, por eso la espera
+  se mide envolviendo _do_get.
+  """
+  monitor: PoolMonitor
+
+  def _do_get(self):
+    started = time.perf_counter()
+    try:
+      connection = super()._do_get()
+    except PoolTimeoutError:
+      self.monitor.record_timeout()
+      raise
+    self.monitor.record_wait(time.perf_counter() - started)
+    return connection
+
+
+# Un monitor por motor; se declara en la clase para sobrevivir a engine.dispose()
+class MonitoredQueuePool(_TimedPoolMixin, QueuePool):
+  monitor = PoolMonitor()
+
+
+class MonitoredAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+  monitor = PoolMonitor()
@@ -1,5 +1,8 @@
 from enum import Enum
-from typing import Generic, List, Optional, TypeVar
+from typing import Any, Generic, List, Mapping, Optional, TypeVar
+from uuid import UUID
+import orjson
+from fastapi import Response
 from pydantic import BaseModel
 
 class ApiStatus(str, Enum):
@@ -17,3 +20,40 @@ class ApiResponse(BaseModel, Generic[T]):
   message: str
   data: Optional[T] = None
   error: Optional[List[ApiFieldError]] = None
+
+
+def _orjson_default(value: Any) -> Any:
+  """
+  Tipos que orjson no serializa por sí mismo.
+  asyncpg devuelve su propia subclase de UUID (DB_MODE=async) y orjson solo acepta uuid.UUID exacto.
+  """
+  if isinstance(value, UUID):
+    return str(value)
+  raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class FastJSONResponse(Response):
+  """
+  Respuesta JSON codificada con orjson.
+  Produce el mismo formato que JSONResponse (compacto, UTF-8, UTC como "Z").
+  """
+  media_type = "application/json"
+
+  def render(self, content: Any) -> bytes:
+    return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_UTC_Z)
+
+def fast_success_response(
+  message: str, data: Optional[BaseModel] = None, headers: Optional[Mapping[str, str]] = None,
+  status_code: int = 200
+) -> FastJSONResponse:
+  """
+  Arma el sobre ApiResponse y lo codifica directamente a bytes.
+  Omite la validación de `response_model` y el paso por jsonable_encoder de FastAPI,
+  por lo que `data` debe provenir de datos confiables (filas del ORM ya tipadas).
+  """
+  content = {
+    "status": ApiStatus.SUCCESS.value,
+    "message": message,
+    "data": data.model_dump() if data is not None else None,
+    "error": None,
+  }
+  return FastJSONResponse(content=content, status_code=status_code, headers=headers)
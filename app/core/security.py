@@ -0,0 +1,55 @@
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from jose import JWTError, jwt
+from app.core.config import get_settings
+from app.core.entity_cache import EntityCache
+
+settings = get_settings()
+
+# Tokens con firma ya verificada: token -> (user_id, expiración como timestamp)
+token_cache: "EntityCache" = EntityCache(
+  "tokens", settings.auth_cache_enabled, settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds
+)
+# Usuarios activos autenticados, por ID (se invalidan al actualizar o eliminar el usuario)
+principal_cache: "EntityCache" = EntityCache(
+  "principals", settings.auth_cache_enabled, settings.auth_cache_max_entries, settings.auth_cache_ttl_seconds
+)
+
+def create_access_token(user_id: int) -> Tuple[str, int]:
+  """Firma un JWT para el usuario; devuelve (token, segundos de validez)"""
+  expires_in = settings.access_token_expire_minutes * 60
+  now = datetime.now(timezone.utc)
+  claims = {"sub": str(user_id), "iat": now, "exp": now + timedelta(seconds=expires_in)}
+  return jwt.encode(claims, settings.secret_key, algorithm=settings.algorithm), expires_in
+
+def decode_access_token(token: str) -> Optional[Tuple[int, float]]:
+  """Verifica firma y expiración; devuelve (user_id, expiración) o None si el token no es válido"""
+  try:
+    claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    return int(claims["sub"]), float(claims["exp"])
+  except (JWTError, KeyError, TypeError, ValueError):
+    return None
+
+def verify_access_token(token: str) -> Optional[int]:
+  """
+  Devuelve el user_id de un token válido o None.
+  La verificación de la firma se cachea por token; la expiración se comprueba en cada uso,
+  por lo que un acierto de la caché nunca extiende la vida del token.
+  Los tokens inválidos no se cachean (no ocupan lugar en la caché).
+  """
+  verified = token_cache.get(token)
+  if verified is None:
+    verified = decode_access_token(token)
+    if verified is None:
+      return None
+    token_cache.set(token, verified)
+  user_id, expires_at = verified
+  if expires_at <= time.time():
+    token_cache.invalidate(token)
+    return None
+  return user_id
+
+def invalidate_principal(user_id: int) -> None:
+  """Descarta el usuario autenticado cacheado (tras actualizarlo, desactivarlo o eliminarlo)"""
+  principal_cache.invalidate(user_id)
@@ -0,0 +1,142 @@
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Listas de parámetros de IN (...) expandidas, literales numéricos y de texto, espacios
+_IN_LIST = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(statement: str) -> str:
+  """
+  Forma de una sentencia: la misma consulta con distintos valores produce la misma forma.
+  Las sentencias de SQLAlchemy ya vienen parametrizadas; solo se normalizan listas IN y literales.
+  """
+  shape = _IN_LIST.sub("IN (?)", statement)
+  shape = _STRING_LITERAL.sub("?", shape)
+  shape = _NUMBER_LITERAL.sub("?", shape)
+  return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryRecord:
+  __slots__ = ("statement", "parameters", "duration", "driver")
+
+  def __init__(self, statement: str, parameters, duration: float, driver: str):
+    self.statement = statement
+    self.parameters = parameters
+    self.duration = duration
+    self.driver = driver
+
+
+class RequestProfile:
+  """Sentencias ejecutadas durante una petición"""
+
+  def __init__(self):
+    self.queries: List[QueryRecord] = []
+
+  @property
+  def total_ms(self) -> float:
+    return sum(query.duration for query in self.queries) * 1000
+
+  def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+    """Formas ejecutadas `threshold` o más veces: probables N+1"""
+    counts = Counter(statement_shape(query.statement) for query in self.queries)
+    return [(shape, count) for shape, count in counts.most_common() if count >= threshold]
+
+  def slowest(self, limit: int) -> List[QueryRecord]:
+    return sorted(self.queries, key=lambda query: query.duration, reverse=True)[:limit]
+
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+  if _current_profile.get() is not None:
+    context._profiler_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+  profile = _current_profile.get()
+  started = getattr(context, "_profiler_started", None)
+  if profile is None or started is None:
+    return
+  profile.queries.append(
+    QueryRecord(statement, parameters, time.perf_counter() - started, conn.dialect.driver)
+  )
+
+def instrument_engine(engine) -> None:
+  """Registra el perfilador en un motor sync (o en `async_engine.sync_engine`)"""
+  event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+  event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SQLProfilerMiddleware:
+  """
+  Perfilador de SQL por petición (solo para desarrollo).
+  - Agrega X-DB-Query-Count y X-DB-Time-Ms a la respuesta.
+  - Reporta por consola las formas de sentencia repetidas `n_plus_one_threshold` o más veces.
+  - Opcionalmente imprime el EXPLAIN de las `explain_top` sentencias más lentas
+    (solo SELECT ejecutados con psycopg2, después de enviar la respuesta).
+  En respuestas en streaming los encabezados solo cuentan las consultas previas al primer byte.
+  """
+
+  def __init__(self, app: ASGIApp, engine, n_plus_one_threshold: int = 5, explain_top: int = 0):
+    self.app = app
+    self.engine = engine
+    self.n_plus_one_threshold = n_plus_one_threshold
+    self.explain_top = explain_top
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if scope["type"] != "http":
+      await self.app(scope, receive, send)
+      return
+
+    profile = RequestProfile()
+    async def send_wrapper(message: Message) -> None:
+      if message["type"] == "http.response.start":
+        headers = MutableHeaders(scope=message)
+        headers["X-DB-Query-Count"] = str(len(profile.queries))
+        headers["X-DB-Time-Ms"] = f"{profile.total_ms:.2f}"
+      await send(message)
+
+    token = _current_profile.set(profile)
+    try:
+      await self.app(scope, receive, send_wrapper)
+    finally:
+      _current_profile.reset(token)
+      self._report(scope, profile)
+    if self.explain_top and profile.queries:
+      await run_in_threadpool(self._explain, profile)
+
+  def _report(self, scope: Scope, profile: RequestProfile) -> None:
+    request = f"{scope['method']} {scope['path']}"
+    print(f"🔎 SQL {request}: {len(profile.queries)} consultas, {profile.total_ms:.2f} ms")
+    for shape, count in profile.repeated_shapes(self.n_plus_one_threshold):
+      print(f"⚠️ Posible N+1 en {request}: {count} ejecuciones de -> {shape[:300]}")
+
+  def _explain(self, profile: RequestProfile) -> None:
+    candidates = [
+      query for query in profile.slowest(self.explain_top)
+      if query.driver == "psycopg2" and query.statement.lstrip().upper().startswith(("SELECT", "WITH"))
+    ]
+    if not candidates:
+      return
+    connection = self.engine.raw_connection()
+    try:
+      cursor = connection.cursor()
+      for query in candidates:
+        try:
+          cursor.execute(f"EXPLAIN {query.statement}", query.parameters)
+          plan = "\n".join(f"     {row[0]}" for row in cursor.fetchall())
+          print(f"🐢 {query.duration * 1000:.2f} ms -> {_WHITESPACE.sub(' ', query.statement)[:300]}\n{plan}")
+        except Exception as e:
+          connection.rollback()
+          print(f"❌ No se pudo obtener el EXPLAIN: {e}")
+      connection.rollback()
+    finally:
+      connection.close()
@@ -0,0 +1,52 @@
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+class StartupReport:
+  """
+  Tiempos del arranque por fase (imports, creación de motores, migraciones...).
+  El reloj empieza al importar este módulo, por eso app.main lo importa primero.
+  """
+
+  def __init__(self):
+    self.started = time.perf_counter()
+    self._last_mark = self.started
+    self.phases: List[Tuple[str, float]] = []
+    self.finished: Optional[float] = None
+
+  def mark(self, name: str) -> None:
+    """Registra el tiempo transcurrido desde la marca anterior"""
+    now = time.perf_counter()
+    self.phases.append((name, now - self._last_mark))
+    self._last_mark = now
+
+  def record(self, name: str, seconds: float) -> None:
+    """Registra una fase medida por separado (puede estar incluida en otra, no mueve la marca)"""
+    self.phases.append((name, seconds))
+
+  @contextmanager
+  def phase(self, name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+      yield
+    finally:
+      self.record(name, time.perf_counter() - started)
+
+  def total(self) -> float:
+    return (self.finished or time.perf_counter()) - self.started
+
+  def print(self) -> None:
+    """Cierra el reporte (la app está lista) y lo muestra por consola"""
+    self.finished = time.perf_counter()
+    print(f"⏱️ Arranque en {self.total() * 1000:.0f} ms")
+    for name, seconds in self.phases:
+      print(f"   - {name}: {seconds * 1000:.0f} ms")
+
+  def as_dict(self) -> dict:
+    return {
+      "total_ms": round(self.total() * 1000, 1),
+      "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases},
+    }
+
+
+startup_report = StartupReport()
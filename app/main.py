@@ -1,5 +1,7 @@
-import subprocess
+# Primer import: inicia el reloj del reporte de arranque
+from app.core.startup import startup_report
 from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
@@ -7,10 +9,21 @@ from app.core.error_handler import setup_exception_handlers
 from app.core.error_type import BaseError
 from app.core.config import get_settings
 from app.api.v1.router import router as api_v1_router
-from app.core.database import test_connection  # Función para probar la conexión a la BD
+from app.core import database
+from app.core.migrations import migrate_if_needed
+from app.core.entity_cache import post_cache, user_cache
+from app.core.security import principal_cache, token_cache
+from app.core.password_hasher import password_hasher
+from app.core.metrics import MetricsMiddleware, instrument_engine, metrics_response
+from app.core import sql_profiler
+from app.core.admission import AdmissionControlMiddleware, admission_controller
+from app.api.v1.post.post_view_counter import post_view_counter
+from app.api.v1.user.user_purge import user_purger
 
 settings = get_settings()
 
+startup_report.mark("imports")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
   """
@@ -23,27 +36,29 @@ async def lifespan(app: FastAPI):
   print(f"   - App: {settings.app_name}")
   print(f"   - Debug: {settings.debug}")
   print(f"   - Database URL: {settings.database_url}")
+  print(f"   - DB mode: {settings.db_mode}")
 
-  try:
-    print("🔍 Verificando conexión a la base de datos...")
-    connected = test_connection()
-  except Exception as e:
-    print(f"❌ Error al conectar a la base de datos: {e}")
-    connected = False
-
-  if connected:
-    print("📦 Aplicando migraciones con Alembic...")
+  if settings.run_migrations_on_startup:
+    # Compara alembic_version con el head de los scripts; solo migra si hace falta.
+    # Se ejecuta en un hilo para no bloquear el event loop durante la conexión.
     try:
-      subprocess.run(["alembic", "upgrade", "head"], check=True)
-      print("✅ Migraciones aplicadas correctamente")
-    except subprocess.CalledProcessError as e:
-      print(f"❌ Error al aplicar migraciones: {e}")
-  else:
-    print("⚠️ La aplicación funcionará sin BD")
+      with startup_report.phase("migrations"):
+        applied = await run_in_threadpool(migrate_if_needed, database.engine)
+      print("✅ Migraciones aplicadas correctamente" if applied else "✅ La base de datos ya está al día")
+    except Exception as e:
+      print(f"❌ Error al verificar o aplicar migraciones: {e}")
+      print("⚠️ La aplicación funcionará sin BD")
+
+  post_view_counter.start()
+  startup_report.print()
 
   yield  # Aquí la app está funcionando
 
   print("🛑 Cerrando aplicación...")
+  await post_view_counter.stop()
+  password_hasher.shutdown()
+  if database.async_engine is not None:
+    await database.async_engine.dispose()
 
 # Inicialización de la aplicación FastAPI con lifespan
 app = FastAPI(
@@ -63,6 +78,31 @@ app.add_middleware(
   allow_headers=["*"],
 )
 
+# Perfilador de SQL por petición (solo en modo debug): conteo, tiempo y detección de N+1
+if settings.debug and settings.sql_profiler_enabled:
+  app.add_middleware(
+    sql_profiler.SQLProfilerMiddleware,
+    engine=database.engine,
+    n_plus_one_threshold=settings.sql_profiler_n_plus_one_threshold,
+    explain_top=settings.sql_profiler_explain_top,
+  )
+  sql_profiler.instrument_engine(database.engine)
+  if database.async_engine is not None:
+    sql_profiler.instrument_engine(database.async_engine.sync_engine)
+
+# Control de admisión: límite de concurrencia por grupo de rutas y de tasa por cliente (503/429 + Retry-After)
+# Queda por fuera del perfilador y por dentro de las métricas, que registran también los rechazos
+if settings.admission_enabled:
+  app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
+# Métricas Prometheus: latencia por ruta, códigos de estado y consultas a la BD
+# Se agrega al final para ser el middleware más externo y medir la petición completa
+if settings.metrics_enabled:
+  app.add_middleware(MetricsMiddleware)
+  instrument_engine(database.engine)
+  if database.async_engine is not None:
+    instrument_engine(database.async_engine.sync_engine)
+
 # Sobrescribimos el handler de validación
 setup_exception_handlers(app)
 
@@ -90,9 +130,25 @@ async def health_check():
   return {
     "status": "healthy",
     "environment": settings.environment,
-    "author": settings.author
+    "author": settings.author,
+    "password_hasher": password_hasher.stats(),
+    "caches": {
+      "posts": post_cache.stats(), "users": user_cache.stats(),
+      "tokens": token_cache.stats(), "principals": principal_cache.stats(),
+    },
+    "post_views": post_view_counter.stats(),
+    "user_purge": user_purger.stats(),
+    "admission": admission_controller.stats() if settings.admission_enabled else None,
+    "database_pool": database.get_pool_stats(),
+    "startup": startup_report.as_dict()
   }
 
+# Endpoint de métricas (formato de exposición de texto de Prometheus)
+if settings.metrics_enabled:
+  @app.get("/metrics", include_in_schema=False)
+  async def metrics():
+    return metrics_response()
+
 # Registro del router principal de la API
 # `prefix` indica que todos los endpoints definidos en este router comenzarán con `/api/v1`
 app.include_router(api_v1_router, prefix="/api/v1")
\ No newline at end of file
@@ -0,0 +1,221 @@
+"""
+Benchmark de carga de los endpoints reales, ejecutados en el mismo proceso a través de la app ASGI
+(httpx.ASGITransport, sin red ni servidor). Requiere una BD con datos (python -m benchmarks.seed).
+
+Para cada escenario y nivel de concurrencia mide throughput y latencia p50/p95/p99 y
+emite un JSON con el commit y la configuración, para comparar entre commits.
+
+Uso: python -m benchmarks.load [--concurrency 1,8,32] [--requests 500] [--scenarios list_posts,get_post]
+                               [--output resultados.json]
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+import httpx
+from sqlalchemy import text
+from app.core.config import get_settings
+from app.core.database import SessionLocal
+from app.core.pool_monitor import percentiles
+from app.main import app
+from benchmarks.seed import FIRST_NAMES, LAST_NAMES, WORDS
+
+settings = get_settings()
+
+API = "/api/v1"
+
+# (método, url, cuerpo JSON)
+RequestSpec = Tuple[str, str, Optional[dict]]
+
+
+class SampleData:
+  """
+  IDs existentes para construir las peticiones (se leen una vez, fuera de la medición).
+  La muestra depende solo de `sample_seed` (setseed de PostgreSQL, en [-1, 1]): con la misma BD
+  y la misma semilla cada corrida pide los mismos posts y usuarios, y los resultados son comparables.
+  """
+
+  def __init__(self, sample_seed: float, sample_size: int = 1000):
+    with SessionLocal() as db:
+      # setseed fija random() para el resto de la sesión (ambas consultas usan la misma conexión)
+      db.execute(text("SELECT setseed(:seed)"), {"seed": sample_seed})
+      self.post_ids = [str(row[0]) for row in db.execute(
+        text("SELECT id FROM posts ORDER BY random() LIMIT :limit"), {"limit": sample_size}
+      )]
+      self.user_ids = [row[0] for row in db.execute(
+        text("SELECT id FROM users ORDER BY random() LIMIT :limit"), {"limit": sample_size}
+      )]
+    if not self.post_ids or not self.user_ids:
+      raise SystemExit("La BD no tiene datos: ejecutar antes python -m benchmarks.seed")
+    self.search_terms = [name[:4].lower() for name in FIRST_NAMES + LAST_NAMES]
+
+
+def list_posts(rng: random.Random, data: SampleData) -> RequestSpec:
+  return "GET", f"{API}/posts/?skip={rng.randint(0, 20) * 10}&limit=10", None
+
+def get_post(rng: random.Random, data: SampleData) -> RequestSpec:
+  return "GET", f"{API}/posts/{rng.choice(data.post_ids)}", None
+
+def search_users(rng: random.Random, data: SampleData) -> RequestSpec:
+  return "GET", f"{API}/users/?search={rng.choice(data.search_terms)}&page=1&limit=10", None
+
+def create_post(rng: random.Random, data: SampleData) -> RequestSpec:
+  body = {
+    "title": " ".join(rng.choices(WORDS, k=6)).capitalize(),
+    "content": " ".join(rng.choices(WORDS, k=rng.randint(50, 500))),
+    "published": rng.random() < 0.7,
+  }
+  return "POST", f"{API}/posts/?user_id={rng.choice(data.user_ids)}", body
+
+def create_user(rng: random.Random, data: SampleData) -> RequestSpec:
+  body = {
+    "email": f"bench.{uuid.uuid4().hex}@bench.example.com",
+    "password": "benchmark123",
+    "first_name": rng.choice(FIRST_NAMES) + "ito",
+    "last_name": rng.choice(LAST_NAMES) + "ez",
+    "role": "user",
+  }
+  return "POST", f"{API}/users/", body
+
+SCENARIOS: Dict[str, Callable[[random.Random, SampleData], RequestSpec]] = {
+  "list_posts": list_posts,
+  "get_post": get_post,
+  "search_users": search_users,
+  "create_post": create_post,
+  "create_user": create_user,
+}
+
+async def run_scenario(
+  client: httpx.AsyncClient,
+  build: Callable[[random.Random, SampleData], RequestSpec],
+  data: SampleData,
+  rng: random.Random,
+  concurrency: int,
+  requests: int,
+) -> dict:
+  latencies: List[float] = []
+  statuses: Counter = Counter()
+  remaining = requests
+
+  async def worker() -> None:
+    nonlocal remaining
+    while remaining > 0:
+      remaining -= 1
+      method, url, body = build(rng, data)
+      started = time.perf_counter()
+      try:
+        response = await client.request(method, url, json=body)
+        statuses[str(response.status_code)] += 1
+      except Exception as e:
+        statuses[type(e).__name__] += 1
+      latencies.append(time.perf_counter() - started)
+
+  started = time.perf_counter()
+  await asyncio.gather(*(worker() for _ in range(concurrency)))
+  elapsed = time.perf_counter() - started
+
+  errors = sum(count for status, count in statuses.items() if not status.startswith(("2", "3")))
+  return {
+    "concurrency": concurrency,
+    "requests": len(latencies),
+    "errors": errors,
+    "statuses": dict(statuses),
+    "elapsed_seconds": round(elapsed, 3),
+    "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    "latency_ms": {
+      name: round(value * 1000, 2) if value is not None else None
+      for name, value in {**percentiles(latencies), "max": max(latencies, default=None)}.items()
+    },
+  }
+
+def git_commit() -> Optional[str]:
+  try:
+    return subprocess.run(
+      ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+async def run(scenarios: List[str], levels: List[int], requests: int, warmup: int, seed_value: int) -> dict:
+  rng = random.Random(seed_value)
+  sample_seed = round(rng.uniform(-1, 1), 6)
+  data = SampleData(sample_seed)
+  results = []
+
+  # Se ejecuta el lifespan de la app (migraciones, tareas en segundo plano) como en producción
+  async with app.router.lifespan_context(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+      for name in scenarios:
+        build = SCENARIOS[name]
+        if warmup:
+          await run_scenario(client, build, data, rng, 1, warmup)
+        for concurrency in levels:
+          result = await run_scenario(client, build, data, rng, concurrency, requests)
+          results.append({"scenario": name, **result})
+          print(
+            f"📊 {name} c={concurrency}: {result['throughput_rps']} req/s, "
+            f"p50={result['latency_ms']['p50']} ms, p99={result['latency_ms']['p99']} ms, "
+            f"errores={result['errors']}"
+          )
+
+  return {
+    "commit": git_commit(),
+    "timestamp": datetime.now(timezone.utc).isoformat(),
+    "python": platform.python_version(),
+    "config": {
+      "db_mode": settings.db_mode,
+      "db_pool_size": settings.db_pool_size,
+      "db_max_overflow": settings.db_max_overflow,
+      "fast_responses": settings.fast_responses,
+      "count_mode": settings.count_mode,
+      "post_cache_enabled": settings.post_cache_enabled,
+      "user_cache_enabled": settings.user_cache_enabled,
+      "bcrypt_rounds": settings.bcrypt_rounds,
+      "admission_enabled": settings.admission_enabled,
+      "admission_limits": {
+        "reads": settings.admission_reads_limit,
+        "writes": settings.admission_writes_limit,
+        "hashing": settings.admission_hashing_limit,
+      },
+    },
+    "requests_per_level": requests,
+    "seed": seed_value,
+    "sample_seed": sample_seed,
+    "results": results,
+  }
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Opciones: {', '.join(SCENARIOS)}")
+  parser.add_argument("--concurrency", default="1,8,32", help="Niveles de concurrencia separados por coma")
+  parser.add_argument("--requests", type=int, default=500, help="Peticiones por escenario y nivel")
+  parser.add_argument("--warmup", type=int, default=20, help="Peticiones de calentamiento (no se miden)")
+  parser.add_argument("--seed", type=int, default=42)
+  parser.add_argument("--output", default=None, help="Archivo JSON de salida (por defecto stdout)")
+  args = parser.parse_args()
+
+  scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+  unknown = [name for name in scenarios if name not in SCENARIOS]
+  if unknown:
+    parser.error(f"Escenarios desconocidos: {', '.join(unknown)}")
+  levels = [int(level) for level in args.concurrency.split(",")]
+
+  report = asyncio.run(run(scenarios, levels, args.requests, args.warmup, args.seed))
+  output = json.dumps(report, indent=2)
+  if args.output:
+    with open(args.output, "w", encoding="utf-8") as file:
+      file.write(output)
+  else:
+    print(output)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,171 @@
+"""
+Generador de datos sintéticos para los benchmarks.
+
+Carga usuarios y posts con COPY (psycopg2) en lotes, con tamaños de `content`
+realistas (distribución log-normal). Con la misma semilla genera siempre los mismos datos.
+
+Uso: python -m benchmarks.seed --users 10000 --posts 100000 [--truncate] [--seed 42]
+(para repetir la carga con la misma semilla usar --truncate: los emails se repiten)
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import string
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from math import log
+from typing import Iterator, Sequence
+from app.core.database import SessionLocal, engine
+from app.core.password_hasher import build_crypt_context
+
+FIRST_NAMES = [
+  "Ana", "Carlos", "María", "José", "Lucía", "Miguel", "Sofía", "Javier", "Valentina", "Diego",
+  "Camila", "Andrés", "Daniela", "Fernando", "Gabriela", "Ricardo", "Paula", "Sebastián", "Elena", "Mateo",
+]
+LAST_NAMES = [
+  "García", "Rodríguez", "Martínez", "Hernández", "López", "González", "Pérez", "Sánchez",
+  "Ramírez", "Torres", "Flores", "Rivera", "Gómez", "Díaz", "Morales", "Castillo", "Romero", "Vargas",
+]
+WORDS = [
+  "api", "datos", "rendimiento", "consulta", "índice", "servidor", "caché", "usuario", "latencia",
+  "python", "postgres", "fastapi", "despliegue", "memoria", "red", "proceso", "sistema", "prueba",
+]
+
+# Contraseña común de los usuarios generados (un solo hash: bcrypt es deliberadamente lento)
+SEED_PASSWORD = "benchmark123"
+
+USER_COLUMNS = ("email", "password", "first_name", "last_name", "role", "is_active", "birth_date", "created_at")
+POST_COLUMNS = (
+  "id", "user_id", "title", "content", "views", "rating", "published",
+  "published_at", "event_date", "created_at",
+)
+
+def content_size(rng: random.Random, mean: int) -> int:
+  """Tamaño log-normal: la mayoría de posts cortos y una cola de posts largos"""
+  sigma = 0.8
+  mu = log(mean) - sigma ** 2 / 2
+  return max(50, min(int(rng.lognormvariate(mu, sigma)), mean * 20))
+
+def make_text(rng: random.Random, size: int) -> str:
+  words = []
+  length = 0
+  while length < size:
+    word = rng.choice(WORDS)
+    words.append(word)
+    length += len(word) + 1
+  return " ".join(words)[:size]
+
+def generate_users(rng: random.Random, count: int, password_hash: str) -> Iterator[tuple]:
+  now = datetime.now(timezone.utc)
+  for i in range(count):
+    first_name = rng.choice(FIRST_NAMES)
+    last_name = rng.choice(LAST_NAMES)
+    suffix = "".join(rng.choices(string.ascii_lowercase, k=4))
+    yield (
+      f"{first_name.lower()}.{i}.{suffix}@bench.example.com", password_hash, first_name, last_name,
+      "admin" if i % 50 == 0 else "user", i % 20 != 0,
+      date(1970, 1, 1) + timedelta(days=rng.randint(0, 365 * 35)),
+      now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600)),
+    )
+
+def generate_posts(rng: random.Random, count: int, user_ids: Sequence[int], content_mean: int) -> Iterator[tuple]:
+  now = datetime.now(timezone.utc)
+  for i in range(count):
+    created_at = now - timedelta(seconds=rng.randint(0, 365 * 24 * 3600))
+    published = rng.random() < 0.7
+    yield (
+      uuid.UUID(int=rng.getrandbits(128), version=4), rng.choice(user_ids),
+      make_text(rng, rng.randint(20, 120)).capitalize(),
+      make_text(rng, content_size(rng, content_mean)),
+      int(rng.paretovariate(1.2)) - 1,
+      round(rng.uniform(1, 5), 2) if rng.random() < 0.6 else None,
+      published,
+      created_at + timedelta(minutes=rng.randint(0, 600)) if published else None,
+      (created_at + timedelta(days=rng.randint(1, 90))).date() if rng.random() < 0.2 else None,
+      created_at,
+    )
+
+def copy_rows(table: str, columns: Sequence[str], rows: Iterator[tuple], batch_size: int) -> int:
+  """COPY ... FROM STDIN por lotes, cada lote en su propia transacción"""
+  copied = 0
+  connection = engine.raw_connection()
+  try:
+    cursor = connection.cursor()
+    while True:
+      buffer = io.StringIO()
+      writer = csv.writer(buffer)
+      batch = 0
+      for row in rows:
+        # NULL se escribe como campo vacío sin comillas (valor por defecto de COPY csv)
+        writer.writerow(["" if value is None else value for value in row])
+        batch += 1
+        if batch >= batch_size:
+          break
+      if not batch:
+        break
+      buffer.seek(0)
+      cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+      connection.commit()
+      copied += batch
+    cursor.close()
+  finally:
+    connection.close()
+  return copied
+
+def seed(users: int, posts: int, content_mean: int, truncate: bool, seed_value: int, batch_size: int) -> dict:
+  rng = random.Random(seed_value)
+  timings = {}
+
+  with SessionLocal() as db:
+    if truncate:
+      db.connection().exec_driver_sql("TRUNCATE posts, users RESTART IDENTITY CASCADE")
+      db.commit()
+
+  started = time.perf_counter()
+  # Costo mínimo: el hash se actualiza al costo configurado en el primer login (rehash al verificar)
+  password_hash = build_crypt_context(4).hash(SEED_PASSWORD)
+  inserted_users = copy_rows("users", USER_COLUMNS, generate_users(rng, users, password_hash), batch_size)
+  timings["users_seconds"] = round(time.perf_counter() - started, 3)
+
+  with SessionLocal() as db:
+    user_ids = [row[0] for row in db.connection().exec_driver_sql("SELECT id FROM users ORDER BY id")]
+
+  started = time.perf_counter()
+  inserted_posts = 0
+  if user_ids and posts:
+    inserted_posts = copy_rows(
+      "posts", POST_COLUMNS, generate_posts(rng, posts, user_ids, content_mean), batch_size
+    )
+  timings["posts_seconds"] = round(time.perf_counter() - started, 3)
+
+  # Estadísticas actualizadas para el planificador (y para COUNT_MODE=estimated)
+  with engine.connect() as connection:
+    connection.execution_options(isolation_level="AUTOCOMMIT").exec_driver_sql("ANALYZE users, posts")
+
+  return {
+    "users": inserted_users,
+    "posts": inserted_posts,
+    "content_mean": content_mean,
+    "seed": seed_value,
+    **timings,
+  }
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--users", type=int, default=10000)
+  parser.add_argument("--posts", type=int, default=100000)
+  parser.add_argument("--content-mean", type=int, default=2000, help="Tamaño medio de content en caracteres")
+  parser.add_argument("--batch-size", type=int, default=5000)
+  parser.add_argument("--seed", type=int, default=42)
+  parser.add_argument("--truncate", action="store_true", help="Vacía users y posts antes de cargar")
+  args = parser.parse_args()
+
+  summary = seed(args.users, args.posts, args.content_mean, args.truncate, args.seed, args.batch_size)
+  print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,102 @@
+"""
+Micro-benchmark de serialización de un listado de posts.
+
+Compara, por elemento:
+- baseline: PostRs.model_validate + ApiResponse + lo que FastAPI hace con `response_model`
+  (validar de nuevo, volcar a JSON con Pydantic y codificar con json.dumps).
+- fast: PostRs.model_construct desde la fila del ORM + fast_success_response (orjson).
+
+Verifica además que ambos caminos producen exactamente los mismos bytes.
+
+Uso: python -m benchmarks.serialization [--items 100] [--content-size 4000] [--rounds 200]
+"""
+import argparse
+import json
+import random
+import string
+import time
+from datetime import date, datetime, timezone
+from uuid import uuid4
+from pydantic import TypeAdapter
+from app.api.v1.post.post_entity import Post
+from app.api.v1.post.post_schema import PostRs, PostsRs
+from app.api.v1.post.post_service import POST_RS_FIELDS
+from app.core.response import ApiResponse, ApiStatus, fast_success_response
+
+MESSAGE = "Posts obtenidos correctamente"
+
+def build_posts(items: int, content_size: int) -> list[Post]:
+  """Entidades Post en memoria, como las devuelve el ORM (sin BD)"""
+  now = datetime.now(timezone.utc)
+  return [
+    Post(
+      id=uuid4(),
+      user_id=random.randint(1, 1000),
+      title=f"Post de prueba {i}",
+      content="".join(random.choices(string.ascii_letters + " áéíóúñ", k=content_size)),
+      views=random.randint(0, 10000),
+      rating=round(random.uniform(0, 5), 2) if i % 3 else None,
+      published=bool(i % 2),
+      published_at=now if i % 2 else None,
+      event_date=date(2025, 1, 1) if i % 4 == 0 else None,
+      created_at=now,
+      updated_at=None,
+    )
+    for i in range(items)
+  ]
+
+def baseline(posts: list[Post], adapter: TypeAdapter) -> bytes:
+  page = PostsRs(
+    posts=[PostRs.model_validate(post) for post in posts],
+    current_page=1, total_pages=1, total_items=len(posts), total_is_exact=True,
+  )
+  body = ApiResponse(status=ApiStatus.SUCCESS, message=MESSAGE, data=page)
+  # Equivalente a serialize_response de FastAPI + JSONResponse.render
+  value = adapter.validate_python(body.model_dump())
+  content = adapter.dump_python(value, mode="json")
+  return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def fast(posts: list[Post]) -> bytes:
+  page = PostsRs(
+    posts=[
+      PostRs.model_construct(**{field: getattr(post, field) for field in POST_RS_FIELDS})
+      for post in posts
+    ],
+    current_page=1, total_pages=1, total_items=len(posts), total_is_exact=True,
+  )
+  return fast_success_response(MESSAGE, page).body
+
+def measure(fn, rounds: int) -> float:
+  started = time.perf_counter()
+  for _ in range(rounds):
+    fn()
+  return (time.perf_counter() - started) / rounds
+
+def main() -> None:
+  parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+  parser.add_argument("--items", type=int, default=100)
+  parser.add_argument("--content-size", type=int, default=4000)
+  parser.add_argument("--rounds", type=int, default=200)
+  args = parser.parse_args()
+
+  posts = build_posts(args.items, args.content_size)
+  adapter = TypeAdapter(ApiResponse[PostsRs])
+
+  identical = baseline(posts, adapter) == fast(posts)
+  baseline_seconds = measure(lambda: baseline(posts, adapter), args.rounds)
+  fast_seconds = measure(lambda: fast(posts), args.rounds)
+
+  print(json.dumps({
+    "items": args.items,
+    "content_size": args.content_size,
+    "rounds": args.rounds,
+    "identical_output": identical,
+    "baseline_us_per_item": round(baseline_seconds / args.items * 1e6, 2),
+    "fast_us_per_item": round(fast_seconds / args.items * 1e6, 2),
+    "saving_us_per_item": round((baseline_seconds - fast_seconds) / args.items * 1e6, 2),
+    "speedup": round(baseline_seconds / fast_seconds, 2) if fast_seconds else None,
+  }, indent=2))
+
+
+if __name__ == "__main__":
+  main()
@@ -1,6 +1,5 @@
 #!/bin/sh
-echo "📦 Aplicando migraciones con Alembic..."
-alembic upgrade head
-
+# Las migraciones se verifican dentro de la app al arrancar (una sola vez, con advisory lock).
+# Para migrar como paso separado: python -m app.core.migrations y RUN_MIGRATIONS_ON_STARTUP=false
 echo "🚀 Iniciando API..."
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+exec uvicorn app.main:app --host 0.0.0.0 --port 8000
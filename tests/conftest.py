@@ -0,0 +1,86 @@
+import os
+
+# Configuración de la app para los tests (antes de importarla: get_settings se cachea).
+# TEST_DATABASE_URL permite apuntar a una BD distinta de la de desarrollo.
+if os.environ.get("TEST_DATABASE_URL"):
+  os.environ["DATABASE_URL"] = os.environ["TEST_DATABASE_URL"]
+# Sin cachés ni tareas en segundo plano: cada petición ejecuta todas sus consultas
+os.environ.setdefault("COUNT_CACHE_TTL_SECONDS", "0")
+os.environ.setdefault("POST_CACHE_ENABLED", "false")
+os.environ.setdefault("USER_CACHE_ENABLED", "false")
+os.environ.setdefault("AUTH_CACHE_ENABLED", "false")
+os.environ.setdefault("POST_VIEWS_ENABLED", "false")
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")  # Costo mínimo: los tests no miden bcrypt
+
+import uuid
+import pytest
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Tuple
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, event, insert
+from app.core import database
+from app.core.database import SessionLocal
+from app.api.v1.post.post_entity import Post
+from app.api.v1.user.user_entity import User
+from app.main import app
+
+API = "/api/v1"
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+  """Cliente sobre la app completa (con lifespan: migraciones al arrancar); requiere PostgreSQL"""
+  if not database.test_connection():
+    pytest.skip("Se requiere una BD PostgreSQL (DATABASE_URL o TEST_DATABASE_URL)")
+  with TestClient(app) as test_client:
+    yield test_client
+
+@pytest.fixture(scope="module")
+def make_author(client) -> Iterator[Callable[[int], Tuple[int, List[str]]]]:
+  """
+  Fábrica de autores: make_author(posts) crea un usuario con `posts` posts publicados
+  y devuelve (user_id, post_ids). Al terminar el módulo se eliminan (los posts en cascada).
+  """
+  user_ids: List[int] = []
+
+  def make_author(posts: int = 0) -> Tuple[int, List[str]]:
+    with SessionLocal() as db:
+      user_id = db.scalars(insert(User).returning(User.id), [{
+        "email": f"author.{uuid.uuid4().hex[:12]}@example.com", "password": "x",
+        "first_name": "Test", "last_name": "Author", "role": "user", "is_active": True,
+      }]).one()
+      post_ids = [str(post_id) for post_id in db.scalars(insert(Post).returning(Post.id), [
+        {"user_id": user_id, "title": f"Post {n}", "content": "contenido", "published": True}
+        for n in range(posts)
+      ])] if posts else []
+      db.commit()
+    user_ids.append(user_id)
+    return user_id, post_ids
+
+  yield make_author
+  with SessionLocal() as db:
+    db.execute(delete(User).where(User.id.in_(user_ids)))
+    db.commit()
+
+class QueryCounter:
+  def __init__(self):
+    self.statements: List[str] = []
+
+  @property
+  def count(self) -> int:
+    return len(self.statements)
+
+@contextmanager
+def count_queries(engine=None) -> Iterator[QueryCounter]:
+  """Cuenta las sentencias SQL enviadas por el motor sync mientras dura el bloque"""
+  engine = engine or database.engine
+  counter = QueryCounter()
+
+  def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    counter.statements.append(statement)
+
+  event.listen(engine, "before_cursor_execute", before_cursor_execute)
+  try:
+    yield counter
+  finally:
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
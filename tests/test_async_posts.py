@@ -0,0 +1,49 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from app.core.config import get_settings
+from app.core.database import get_async_database_url, get_async_db
+from app.api.v1.post.post_async_controller import router as post_async_router
+from tests.conftest import API
+
+settings = get_settings()
+
+@pytest.fixture(scope="module")
+def async_client(client):
+  """
+  Controladores de posts de DB_MODE=async sobre asyncpg.
+  El modo se elige al importar la app, por lo que se montan en una app aparte.
+  """
+  engine = create_async_engine(get_async_database_url(settings.database_url), poolclass=NullPool)
+  sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+  async def get_test_async_db():
+    async with sessions() as db:
+      yield db
+
+  async_app = FastAPI()
+  async_app.include_router(post_async_router, prefix=f"{API}/posts")
+  async_app.dependency_overrides[get_async_db] = get_test_async_db
+  with TestClient(async_app) as test_client:
+    yield test_client
+
+def test_async_post_reads_match_response_model_path(async_client, make_author, monkeypatch):
+  # asyncpg devuelve su propia subclase de UUID: la ruta rápida (orjson) debe producir los mismos bytes
+  user_id, (post_id,) = make_author(1)
+  urls = [f"{API}/posts/{post_id}", f"{API}/posts/?user_id={user_id}&include=author"]
+
+  for url in urls:
+    bodies = []
+    for fast_responses in (True, False):
+      monkeypatch.setattr(settings, "fast_responses", fast_responses)
+      response = async_client.get(url)
+      assert response.status_code == 200, f"{url} (fast_responses={fast_responses}): {response.text}"
+      bodies.append(response.content)
+    assert bodies[0] == bodies[1], url
+
+  post = async_client.get(urls[0]).json()["data"]
+  assert post["id"] == post_id
+  posts = async_client.get(urls[1]).json()["data"]["posts"]
+  assert [(item["id"], item["author"]["id"]) for item in posts] == [(post_id, user_id)]
@@ -0,0 +1,26 @@
+import uuid
+from app.core.password_hasher import password_hasher
+from tests.conftest import API
+
+def test_unknown_email_still_verifies_a_password(client):
+  # Sin bcrypt para emails inexistentes el tiempo de respuesta revelaría qué emails están registrados
+  form = {"username": f"nobody.{uuid.uuid4().hex[:8]}@example.com", "password": "incorrecta"}
+  client.post(f"{API}/auth/token", data=form)  # Calcula el hash de referencia
+  submitted = password_hasher.stats()["submitted"]
+
+  response = client.post(f"{API}/auth/token", data=form)
+
+  assert response.status_code == 401, response.text
+  assert password_hasher.stats()["submitted"] == submitted + 1
+
+def test_unauthorized_responses_ask_for_bearer_token(client):
+  form = {"username": f"nobody.{uuid.uuid4().hex[:8]}@example.com", "password": "incorrecta"}
+  responses = [
+    client.post(f"{API}/auth/token", data=form),
+    client.get(f"{API}/auth/me"),
+    client.get(f"{API}/auth/me", headers={"Authorization": "Bearer no-es-un-jwt"}),
+  ]
+
+  for response in responses:
+    assert response.status_code == 401, response.text
+    assert response.headers["www-authenticate"] == "Bearer"
@@ -0,0 +1,40 @@
+import pytest
+from tests.conftest import API, count_queries
+
+PAGE_SIZES = (2, 10)
+SEED_USERS = 12
+POSTS_PER_USER = 3
+
+@pytest.fixture(scope="module")
+def seeded_users(make_author):
+  """Usuarios con posts suficientes para llenar las páginas de ambos tamaños"""
+  return [make_author(POSTS_PER_USER)[0] for _ in range(SEED_USERS)]
+
+def queries_per_page(client, url_for_size) -> dict:
+  """Sentencias SQL por tamaño de página (tras una petición de calentamiento)"""
+  client.get(url_for_size(PAGE_SIZES[0]))
+  counts = {}
+  for size in PAGE_SIZES:
+    with count_queries() as counter:
+      response = client.get(url_for_size(size))
+    assert response.status_code == 200, response.text
+    counts[size] = (counter.count, response.json()["data"])
+  return counts
+
+def test_posts_include_author_uses_fixed_number_of_queries(client, seeded_users):
+  counts = queries_per_page(client, lambda size: f"{API}/posts/?limit={size}&include=author")
+
+  for size, (_, data) in counts.items():
+    assert len(data["posts"]) == size
+    assert all(post["author"] is not None for post in data["posts"])
+  small, large = (counts[size][0] for size in PAGE_SIZES)
+  assert small == large, f"consultas por página: {small} (limit={PAGE_SIZES[0]}) vs {large} (limit={PAGE_SIZES[1]})"
+
+def test_users_include_recent_posts_uses_fixed_number_of_queries(client, seeded_users):
+  counts = queries_per_page(client, lambda size: f"{API}/users/?page=1&limit={size}&include=recent_posts")
+
+  for size, (_, data) in counts.items():
+    assert len(data["users"]) == size
+    assert all(user["recent_posts"] is not None for user in data["users"])
+  small, large = (counts[size][0] for size in PAGE_SIZES)
+  assert small == large, f"consultas por página: {small} (limit={PAGE_SIZES[0]}) vs {large} (limit={PAGE_SIZES[1]})"
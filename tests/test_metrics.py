@@ -0,0 +1,14 @@
+from tests.conftest import API
+
+def test_route_labels_use_full_templates(client, make_author):
+  user_id, (post_id,) = make_author(1)
+  assert client.get(f"{API}/posts/{post_id}").status_code == 200
+  assert client.get(f"{API}/posts/").status_code == 200
+  assert client.get(f"{API}/users/{user_id}").status_code == 200
+
+  metrics = client.get("/metrics").text
+
+  assert 'route="/api/v1/posts/{post_id}"' in metrics
+  assert 'route="/api/v1/posts/"' in metrics
+  assert 'route="/api/v1/users/{user_id}"' in metrics
+  assert f"/posts/{post_id}" not in metrics
@@ -0,0 +1,16 @@
+from app.core.count_cache import count_cache
+from tests.conftest import API
+
+def test_filtered_total_is_refreshed_after_update(client, make_author, monkeypatch):
+  # Caché de conteos activa solo en este test (conftest la desactiva)
+  monkeypatch.setattr(count_cache, "ttl_seconds", 60)
+  # Dos posts publicados; el filtro user_id aísla el total de otros datos
+  user_id, post_ids = make_author(2)
+  url = f"{API}/posts/?user_id={user_id}&published=true"
+
+  assert client.get(url).json()["data"]["total_items"] == 2
+
+  response = client.put(f"{API}/posts/{post_ids[0]}", json={"published": False})
+  assert response.status_code == 200, response.text
+
+  assert client.get(url).json()["data"]["total_items"] == 1
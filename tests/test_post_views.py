@@ -0,0 +1,22 @@
+from app.core.entity_cache import post_cache
+from app.api.v1.post.post_view_counter import post_view_counter
+from tests.conftest import API
+
+def test_flushed_views_change_etag_and_cached_post(client, make_author, monkeypatch):
+  # Caché de posts y conteo de vistas activos solo en este test (conftest los desactiva)
+  monkeypatch.setattr(post_cache, "enabled", True)
+  monkeypatch.setattr(post_view_counter, "enabled", True)
+  _, (post_id,) = make_author(1)
+  try:
+    first = client.get(f"{API}/posts/{post_id}")
+    assert first.status_code == 200, first.text
+    assert first.json()["data"]["views"] == 0
+
+    assert post_view_counter.flush() == 1
+
+    second = client.get(f"{API}/posts/{post_id}", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200, second.text
+    assert second.json()["data"]["views"] == 1
+    assert second.headers["etag"] != first.headers["etag"]
+  finally:
+    post_cache.clear()
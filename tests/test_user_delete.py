@@ -0,0 +1,21 @@
+from app.api.v1.user.user_purge import user_purger
+from tests.conftest import API
+
+def test_delete_with_many_posts_is_purged_in_background(client, make_author, monkeypatch):
+  # Umbral bajo solo en este test: con más de un post la eliminación se difiere
+  monkeypatch.setattr(user_purger, "async_threshold", 1)
+  user_id, _ = make_author(2)
+
+  response = client.delete(f"{API}/users/{user_id}")
+
+  assert response.status_code == 202, response.text
+  assert response.json()["message"] == "Eliminación del usuario programada"
+  # TestClient ejecuta las BackgroundTasks antes de devolver la respuesta
+  assert client.get(f"{API}/users/{user_id}").status_code == 404
+
+def test_delete_documents_both_outcomes(client):
+  responses = client.get("/openapi.json").json()["paths"]["/api/v1/users/{user_id}"]["delete"]["responses"]
+
+  assert "204" in responses
+  assert "202" in responses
+  assert "content" in responses["202"]
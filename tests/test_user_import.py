@@ -0,0 +1,30 @@
+import json
+import uuid
+from sqlalchemy import delete
+from app.core.database import SessionLocal
+from app.api.v1.user.user_entity import User
+from tests.conftest import API
+
+def user_line(email: str) -> str:
+  return json.dumps({
+    "email": email, "password": "secreto123", "first_name": "Import", "last_name": "Tester", "role": "user"
+  })
+
+def test_ndjson_import_reports_bad_lines_and_keeps_importing(client):
+  emails = [f"import.{uuid.uuid4().hex[:8]}.{i}@example.com" for i in range(2)]
+  lines = [user_line(emails[0]), "123", "[1]", '{"email": ', user_line(emails[1])]
+  try:
+    response = client.post(
+      f"{API}/users/import",
+      files={"file": ("usuarios.ndjson", "\n".join(lines).encode(), "application/x-ndjson")},
+    )
+    assert response.status_code == 200, response.text
+    result = response.json()["data"]
+    assert result["processed"] == 5
+    assert result["inserted"] == 2
+    assert result["invalid"] == 3
+    assert [error["line"] for error in result["errors"]] == [2, 3, 4]
+  finally:
+    with SessionLocal() as db:
+      db.execute(delete(User).where(User.email.in_(emails)))
+      db.commit()
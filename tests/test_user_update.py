@@ -0,0 +1,14 @@
+from tests.conftest import API
+
+def test_patch_to_registered_email_is_a_conflict(client, make_author):
+  user_id, _ = make_author()
+  other_id, _ = make_author()
+  taken = client.get(f"{API}/users/{other_id}").json()["data"]["email"]
+
+  response = client.patch(f"{API}/users/{user_id}", json={"email": taken})
+
+  assert response.status_code == 409, response.text
+  assert response.json()["message"] == "El email ya está registrado"
+  # Conservar el propio email no es un conflicto
+  own = client.get(f"{API}/users/{user_id}").json()["data"]["email"]
+  assert client.patch(f"{API}/users/{user_id}", json={"email": own}).status_code == 200